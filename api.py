@@ -0,0 +1,211 @@
+import argparse
+import gzip
+import hashlib
+import json
+import math
+from dataclasses import dataclass
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from charts import AGE_MAX, LUT_STEP, X_RANGE, clamp, curve_until
+from decks import DECKS, DEFAULT_DECK, get_deck
+
+# =========================
+# JSON API
+# =========================
+# Read-only HTTP endpoints over the same deck data the app renders, for
+# tools that want band text or curve values without scraping the page:
+#
+#   GET /decks                  registered decks
+#   GET /band?age=47.5          the band covering that age (404 outside the deck)
+#   GET /curve?until=60         the drawn curve from 0 to that age, and its value there
+#   GET /figure/3               band 3's plotly figure spec
+#
+# Every endpoint takes ?deck= (default: the default deck). All responses are
+# serialized, gzipped and hashed once per deck when the app starts (curve
+# ages are quantized to the LUT step, so there are only a few hundred), and
+# rebuilt only when a deck hot-reloads. A request is a table lookup plus an
+# ETag comparison; unchanged responses revalidate as 304s.
+#
+#   python api.py --port 8600
+#   uvicorn api:make_app --factory --port 8600
+GZIP_MIN_BYTES = 512  # smaller bodies aren't worth the Content-Encoding
+
+
+@dataclass(frozen=True, slots=True)
+class Body:
+    raw: bytes
+    gz: bytes | None
+    etag: str  # strong; the gzip representation gets its own
+
+    @classmethod
+    def from_json(cls, text: str) -> "Body":
+        raw = text.encode("utf-8")
+        gz = gzip.compress(raw, mtime=0) if len(raw) >= GZIP_MIN_BYTES else None
+        return cls(raw, gz, hashlib.sha256(raw).hexdigest()[:20])
+
+    @classmethod
+    def of(cls, obj) -> "Body":
+        return cls.from_json(json.dumps(obj, separators=(",", ":"), ensure_ascii=False))
+
+
+def band_record(deck, idx: int) -> dict:
+    band = deck.bands[idx]
+    return {
+        "deck": deck.id,
+        "idx": idx,
+        "a0": band.a0,
+        "a1": band.a1,
+        "heading": band.heading,
+        "bullets": list(band.bullets),
+        "diagnosis": band.diagnosis,
+        "prescription": band.prescription,
+        "engine": band.engine.value,
+        "figure": f"/figure/{idx}?deck={deck.id}",
+    }
+
+
+def curve_record(deck, x_end: float) -> dict:
+    # Clipped exactly as build_health_fig draws it
+    xs, ys = curve_until(deck.lut, x_end)
+    return {"deck": deck.id, "until": xs[-1], "value": ys[-1], "x": xs, "y": ys}
+
+
+class DeckResponses:
+    def __init__(self, deck):
+        self.deck = deck
+        n_steps = round((AGE_MAX - X_RANGE[0]) / LUT_STEP)
+        # The deck's bands are contiguous (BandIndex checks), so this is what they cover
+        self.ages = (min(band.a0 for band in deck.bands), max(band.a1 for band in deck.bands))
+        self.bands = [Body.of(band_record(deck, i)) for i in range(len(deck.bands))]
+        self.figures = [Body.from_json(deck.figure(band.a1)["json"]) for band in deck.bands]
+        self.curve = [Body.of(curve_record(deck, X_RANGE[0] + k * LUT_STEP)) for k in range(n_steps + 1)]
+
+
+# -------------------------
+# HTTP
+# -------------------------
+def error(status: int, message: str) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def accepts_gzip(request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def not_modified(request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    # If-None-Match uses the weak comparison, so a W/ prefix still matches.
+    return any(tag.strip().removeprefix("W/") in (etag, "*") for tag in header.split(","))
+
+
+def respond(request, body: Body) -> Response:
+    gz = body.gz is not None and accepts_gzip(request)
+    etag = f'"{body.etag}-gz"' if gz else f'"{body.etag}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    if gz:
+        headers["Content-Encoding"] = "gzip"
+    return Response(body.gz if gz else body.raw, media_type="application/json", headers=headers)
+
+
+def number_param(request, name: str, default=None):
+    value = request.query_params.get(name)
+    if value is None:
+        if default is None:
+            raise ValueError(f"Missing ?{name}=")
+        return default
+    try:
+        x = float(value)
+    except ValueError:
+        x = math.nan
+    if not math.isfinite(x):
+        raise ValueError(f"?{name}= must be a finite number")
+    return x
+
+
+def make_app(deck_ids=None) -> Starlette:
+    responses = {deck_id: DeckResponses(get_deck(deck_id)) for deck_id in deck_ids or DECKS}
+    decks_body = Body.of([{"id": d, "title": DECKS[d]["page_title"]} for d in DECKS])
+
+    async def deck_responses(request) -> DeckResponses:
+        deck_id = request.query_params.get("deck", DEFAULT_DECK)
+        if deck_id not in DECKS:
+            raise KeyError(deck_id)
+        current = responses.get(deck_id)
+        deck = get_deck(deck_id)  # also picks up source document edits
+        if current is None or current.deck is not deck:
+            current = responses[deck_id] = await run_in_threadpool(DeckResponses, deck)
+        return current
+
+    async def decks(request):
+        return respond(request, decks_body)
+
+    async def band(request):
+        try:
+            tables = await deck_responses(request)
+            age = number_param(request, "age")
+        except KeyError as e:
+            return error(404, f"Unknown deck {e.args[0]!r}")
+        except ValueError as e:
+            return error(400, str(e))
+        # band_for_age clamps (for the app's deep links); here an uncovered age
+        # has no band.
+        a0, a1 = tables.ages
+        if not a0 <= age <= a1:
+            return error(404, f"No band covers age {age:g}; the deck covers {a0:g}–{a1:g}")
+        return respond(request, tables.bands[tables.deck.band_for_age(age)])
+
+    async def curve(request):
+        try:
+            tables = await deck_responses(request)
+            until = number_param(request, "until", AGE_MAX)
+        except KeyError as e:
+            return error(404, f"Unknown deck {e.args[0]!r}")
+        except ValueError as e:
+            return error(400, str(e))
+        k = round((clamp(until, X_RANGE[0], AGE_MAX) - X_RANGE[0]) / LUT_STEP)
+        return respond(request, tables.curve[k])
+
+    async def figure(request):
+        try:
+            tables = await deck_responses(request)
+        except KeyError as e:
+            return error(404, f"Unknown deck {e.args[0]!r}")
+        idx = request.path_params["idx"]
+        if not 0 <= idx < len(tables.figures):
+            return error(404, f"No band {idx}; the deck has {len(tables.figures)}")
+        return respond(request, tables.figures[idx])
+
+    return Starlette(
+        routes=[
+            Route("/decks", decks),
+            Route("/band", band),
+            Route("/curve", curve),
+            Route("/figure/{idx:int}", figure),
+        ]
+    )
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the deck JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args()
+    uvicorn.run(make_app(), host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
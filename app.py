@@ -1,643 +1,564 @@
+import hashlib
+import json
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date
+from pathlib import Path
+
 import streamlit as st
-import plotly.graph_objects as go
-
-# =========================
-# AUTHORITATIVE TEXT SOURCE
-# =========================
-# Populated from: "Life Reclamation Project Health text for SAL and LRP Slides.docx"
-# Dan confirmed these docs are authoritative.
-
-BANDS = [
-    {
-        "a0": 0,
-        "a1": 5,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Health is assumed and unexamined.",
-        "bullets": [
-            "Lots of unstructured play, exploration, and bonding with parents",
-            "Sleep is mostly protected; routines feel supportive and calming",
-            "Daycare schedules, frequent illness, and hand-offs begin to disrupt rhythm",
-            "Screens are introduced occasionally to soothe, distract, or buy quiet",
-        ],
-        "diagnosis": "Everything looks normal and on track for age.",
-        "prescription": "Stay on schedule with the ~25 to 35 vaccinations. Use antibiotics and fever reducers when needed. Kids are resilient — there’s nothing to worry about.",
-        "engine": "green",
-    },
-    {
-        "a0": 5,
-        "a1": 10,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Activity is natural and effortless.",
-        "bullets": [
-            "Real play with friends is still common; movement happens naturally and joyfully",
-            "A first sport or activity is introduced — with fruit snacks and juice boxes as the reward",
-            "Screens and online entertainment increasingly fill “in-between” time",
-            "Busy schedules lead to quicker meals and less intentional nutrition",
-        ],
-        "diagnosis": "Healthy growth and development within expected ranges.",
-        "prescription": "Keep doing what you’re doing. Encourage activity, limit treats when you can, and address issues as they come up.",
-        "engine": "green",
-    },
-    {
-        "a0": 10,
-        "a1": 15,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Structure increases, resilience masks cost.",
-        "bullets": [
-            "Organized sports and activities increase, but free play declines",
-            "Screens, games, and phones begin to dominate downtime and social life",
-            "Sleep duration and quality erodes due to early schedules and late-night stimulation",
-            "Food choices tilt increasingly toward convenience and peer-influenced habits",
-        ],
-        "diagnosis": "Typical adolescent changes; fatigue, mood swings, and irregular sleep are common.",
-        "prescription": "Try to get enough sleep, eat reasonably well, and stay active when schedules allow. This phase usually passes.",
-        "engine": "green",
-    },
-    {
-        "a0": 15,
-        "a1": 20,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Activity stays high as recovery slips.",
-        "bullets": [
-            "Fitness takes a back seat, with perhaps one school sport remaining as the last truly demanding activity",
-            "Sleep erodes further due to school demands, increased screen time, and social schedules",
-            "Caffeine, sugar, and ultra-processed foods are used to manage energy and stress",
-            "Strength training, cardio, and recovery, that were never foundational, slip even further away",
-        ],
-        "diagnosis": "Occasional bouts of anxiety, low mood, and emotional volatility are considered normal at this age. Plus weight gain.",
-        "prescription": "Try reducing screen time, get some fresh air, and manage stress. Revisit if problems persist or worsen.",
-        "engine": "yellow",
-    },
-    {
-        "a0": 20,
-        "a1": 25,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Movement is quietly replaced.",
-        "bullets": [
-            "Physical activity declines sharply as college and early career demands dominate daily life",
-            "Long hours seated at a laptop replace movement, with posture and mobility beginning to suffer",
-            "Sleep irregularities worsen due to deadlines, online social demands, and screen exposure",
-            "Convenience foods, caffeine, and snacks are used to sustain focus and productivity while alcohol is used to unwind and decompress",
-        ],
-        "diagnosis": "Young and generally healthy despite irregular routines.",
-        "prescription": "Focus on stress management. Eat right when you can, stay active when possible, and don’t worry too much — you’re young!",
-        "engine": "yellow",
-    },
-    {
-        "a0": 25,
-        "a1": 30,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Health competes with productivity.",
-        "bullets": [
-            "Fitness becomes sporadic, squeezed in only when time and energy allow",
-            "Long hours sitting at work carry over into evenings and weekends",
-            "Along with weight gain, minor aches and stiffness appear, but are dismissed as temporary or stress-related",
-            "Sleep and nutrition are traded for productivity, convenience, social life, and more routine alcohol use",
-        ],
-        "diagnosis": "Lifestyle strain and weight gain is noted, but nothing is outside normal expectations.",
-        "prescription": "Try to eat better, exercise more, and get more sleep. Small changes add up.",
-        "engine": "yellow",
-    },
-    {
-        "a0": 30,
-        "a1": 35,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "“I’ll get back to it later.”",
-        "bullets": [
-            "Career and family demands make any attempt at consistent training feel nearly impossible",
-            "Sitting, stress, and mental load dominate most days",
-            "Weight gain, stiffness, and recurring pain accelerates",
-            "Health is managed reactively, with plans to “get back on track” later",
-        ],
-        "diagnosis": "Weight gain, fatigue, and aches are typical at this stage of life.",
-        "prescription": "Work on balance. Lose a little weight if you can, be more active when time allows.",
-        "engine": "yellow",
-    },
-    {
-        "a0": 35,
-        "a1": 40,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Stress and decline feel ordinary.",
-        "bullets": [
-            "Work and family responsibilities and distractions consume most discretionary time",
-            "Chronic stress, decreased productivity and long hours accumulate",
-            "Lingering pain and fatigue is ever present",
-            "Health is discussed more than acted upon",
-        ],
-        "diagnosis": "Cumulative stress effects are apparent, though labs remain acceptable.",
-        "prescription": "Continue monitoring. Lifestyle changes may help if symptoms worsen.",
-        "engine": "yellow",
-    },
-    {
-        "a0": 40,
-        "a1": 45,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Warning lights flicker.",
-        "bullets": [
-            "Energy and resilience decline is becoming pronounced",
-            "Blood pressure, cholesterol, and weight creep ever upward",
-            "Exercise remains aspirational, never habitual",
-            "Health is outsourced to annual checkups, and red flag deferrals",
-        ],
-        "diagnosis": "Risk factors are emerging, but consistent with “normal aging.”",
-        "prescription": "Watch the numbers. Eat right, exercise more, and we’ll recheck next year.",
-        "engine": "yellow",
-    },
-    {
-        "a0": 45,
-        "a1": 50,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Prevention gives way to control.",
-        "bullets": [
-            "Health concerns feel more personal as peers face diagnoses",
-            "Medications or guidance are introduced",
-            "Physical activity is cautiously introduced but dropped",
-            "Capacity continues to decline",
-        ],
-        "diagnosis": "Blood pressure, cholesterol, or weight are trending upward.",
-        "prescription": "Try diet and exercise first. If trends continue, medication can help.",
-        "engine": "orange",
-    },
-    {
-        "a0": 50,
-        "a1": 55,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Comfort replaces capability.",
-        "bullets": [
-            "Daily routines adjust to avoid discomfort",
-            "Strength, balance, and power have diminished greatly",
-            "Travel and hobbies are chosen with limits in mind",
-            "Health decisions prioritize symptom control",
-        ],
-        "diagnosis": "Age-related functional decline is within expected limits.",
-        "prescription": "Adjust activities to what you can do. Avoid overdoing it.",
-        "engine": "orange",
-    },
-    {
-        "a0": 55,
-        "a1": 60,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Decline steepens.",
-        "bullets": [
-            "Strength and stamina drop faster than expected",
-            "Pain and chronic conditions shape daily choices",
-            "Exercise becomes “therapy,” not growth",
-            "Independence remains, but health is fading, shrinking",
-        ],
-        "diagnosis": "Early chronic conditions such as prediabetes or hypertension are identified.",
-        "prescription": "Begin standard medical therapy. Focus on compliance and monitoring.",
-        "engine": "red",
-    },
-    {
-        "a0": 60,
-        "a1": 65,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Effort carries a cost.",
-        "bullets": [
-            "Independence persists, but effort requires planning",
-            "Strength and aerobic capacity have eroded",
-            "Medications are routine",
-            "Activities are chosen to minimize falls and fractures",
-        ],
-        "diagnosis": "We are doing what we can. Multiple risk factors have pharmaceutical answers.",
-        "prescription": "Prioritize safety and consistency.",
-        "engine": "red",
-    },
-    {
-        "a0": 65,
-        "a1": 70,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Confidence fades.",
-        "bullets": [
-            "Physical confidence declines",
-            "Recovery becomes unreliable",
-            "Medications expand",
-            "Daily choices prioritize safety",
-        ],
-        "diagnosis": "Declined strength is attributed to normal aging.",
-        "prescription": "Simplify routines. Avoid injury.",
-        "engine": "red",
-    },
-    {
-        "a0": 70,
-        "a1": 75,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Risk becomes central.",
-        "bullets": [
-            "Restricting daily activities, outings, or hobbies around limited energy levels",
-            "Independence relies on complex, daily medication management with side effects",
-            "Bone density is greatly reduced while minor scrapes or bruises take longer to heal",
-            "Recovery from illness or injury requires a longer-term rest or physical therapy",
-        ],
-        "diagnosis": "Falls and slower recovery are expected at this age.",
-        "prescription": "Use assistive devices. Modify living space.",
-        "engine": "red",
-    },
-    {
-        "a0": 75,
-        "a1": 77,
-        "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
-        "word": "health",
-        "pos": "noun",
-        "phon": "/helTH/",
-        "def1": "the absence of disease or infirmity",
-        "def2": "also: the capacity to live, move, and engage fully with life",
-        "heading": "Decline ends abruptly.",
-        "bullets": [
-            "Multiple health conditions (heart disease, diabetes, dementia) are likely to coexist and interact, complicating treatment and recovery",
-            "Rapid reduction in strength, walking speed, and overall energy levels makes daily activities extremely hard",
-            "The failing immune system turns minor illness into life threatening pneumonia or sepsis",
-            "A prolonged homebound or nursing-home physical decline ends in Death",
-        ],
-        "diagnosis": "Serious illness or injury is common.",
-        "prescription": "Hospitalization, rehab, or hospice. Focus on comfort.",
-        "engine": "red",
-    },
-]
+import streamlit.components.v1 as components
+
+from charts import AGE_MAX, FRAME_TRANSITION, LUT_STEP, clamp, overlay_payload
+from cohort import DISTRIBUTIONS, CohortParams
+import broadcast
+import perf
+import wearable
+from decks import DECKS, DEFAULT_DECK, get_deck
+from render import APP_CSS, ASSET_BASE, KIOSK_CSS, dots_html, stylesheet_url, write_static_assets, write_static_file
 
 # -------------------------
-# App config
+# Deck selection (?deck=<id>)
 # -------------------------
-st.set_page_config(page_title="LRP • Health (SAL)", layout="wide")
+if "deck_id" not in st.session_state:
+    requested = st.query_params.get("deck", DEFAULT_DECK)
+    st.session_state.deck_id = requested if requested in DECKS else DEFAULT_DECK
 
 # -------------------------
-# CSS: tuned to reduce clipping at 100% zoom
+# App config
 # -------------------------
-st.markdown(
-    """
-<style>
-/* More top padding to avoid header clipping */
-.block-container { padding-top: 2.0rem; padding-bottom: 1.0rem; max-width: 1500px; }
-
-/* Cards */
-.lrp-card {
-  background: rgba(255,255,255,0.97);
-  border: 1px solid rgba(0,0,0,0.06);
-  border-radius: 18px;
-  box-shadow: 0 8px 24px rgba(0,0,0,0.06);
-  padding: 16px 16px 14px 16px;
-}
-
-/* Header */
-.lrp-title {
-  font-weight: 850;
-  letter-spacing: 0.4px;
-  font-size: 24px;
-  margin-bottom: 10px;
-}
-
-/* Dictionary styling */
-.lrp-dictword { font-size: 20px; font-weight: 850; margin-top: 4px; }
-.lrp-pos { font-size: 13px; color: rgba(0,0,0,0.55); font-weight: 650; margin-left: 8px; }
-.lrp-phon { font-size: 16px; color: rgba(0,0,0,0.50); margin-top: 6px; font-style: italic; }
-.lrp-def { font-size: 14px; margin-top: 10px; line-height: 1.35; }
-.lrp-defnum { color: rgba(0,0,0,0.55); font-weight: 850; display: inline-block; width: 26px; }
-
-/* Right heading */
-.lrp-heading { font-size: 18px; font-weight: 900; margin: 0 0 10px 0; }
-
-/* Bullets */
-.lrp-bullets { font-size: 14px; line-height: 1.4; }
-.lrp-bullets ul { margin: 0; padding-left: 18px; }
-.lrp-bullets li { margin: 6px 0; }
-
-/* Left diagnosis card labels */
-.lrp-label {
-  font-weight: 900;
-  letter-spacing: 0.6px;
-  font-size: 12px;
-  color: rgba(0,0,0,0.55);
-  margin-top: 6px;
-  text-transform: uppercase;
-  display:flex;
-  align-items:center;
-  gap:10px;
-}
-.lrp-body { font-size: 14px; line-height: 1.45; margin-top: 6px; margin-bottom: 10px; }
-
-/* Icons (bigger) */
-.lrp-ico { font-size: 28px; width: 32px; text-align: center; }
-
-/* Check engine svg (bigger icon) */
-.engine-svg { width: 74px; height: 74px; }
-
-/* Navigation */
-.ages-label { font-size: 22px; font-weight: 900; text-align:center; margin-top: 8px; }
-.dots { display:flex; justify-content:center; gap: 6px; margin-top: 8px; }
-.dot { width: 7px; height: 7px; border-radius: 50%; background: rgba(0,0,0,0.18); }
-.dot.active { background: #d11a1a; }
-
-/* Plot container */
-.plot-card { padding: 10px 14px 6px 14px; }
-</style>
-""",
-    unsafe_allow_html=True,
+st.set_page_config(
+    page_title=DECKS[st.session_state.deck_id]["page_title"],
+    layout="wide",
+    initial_sidebar_state="collapsed" if st.query_params.get("kiosk") == "1" else "auto",
 )
 
 # -------------------------
-# Session state
+# Static assets (CSS + engine sprite)
 # -------------------------
-if "idx" not in st.session_state:
-    st.session_state.idx = 0
+# Written once per process under static/ (served at /app/static/ via
+# .streamlit/config.toml). If that directory isn't writable and the files
+# are missing, the CSS is inlined instead.
+STATIC_DIR = Path(__file__).parent / "static"
+
+
+@st.cache_resource
+def static_assets_ready() -> bool:
+    try:
+        write_static_assets(STATIC_DIR)
+    except OSError:
+        return False
+    return True
+
+
+@st.cache_resource(max_entries=32)
+def static_url(name: str, _text: str):
+    # Generated per-deck assets (the thumbnail sprite), keyed by their hashed
+    # name; None when static/ isn't writable.
+    try:
+        write_static_file(STATIC_DIR, name, _text)
+    except OSError:
+        return None
+    return ASSET_BASE + name
+
+
+def page_css() -> str:
+    if static_assets_ready():
+        return f'<link rel="stylesheet" href="{stylesheet_url()}">'
+    return f"<style>{APP_CSS}</style>"
 
 
 # -------------------------
-# Helpers
+# Deep links (?band=N, 1-based, or ?age=43.5)
 # -------------------------
-def clamp(v, lo, hi):
-    return max(lo, min(hi, v))
+def query_float(name: str):
+    try:
+        value = float(st.query_params[name])
+    except (KeyError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
 
 
-def engine_svg(color_key: str) -> str:
-    palette = {
-        "green": "#17a34a",
-        "yellow": "#f59e0b",
-        "orange": "#f97316",
-        "red": "#ef4444",
-    }
-    c = palette.get(color_key, "#17a34a")
-
-    # Bigger engine (no outer circle)
-    return f"""
-<svg class="engine-svg" viewBox="0 0 64 64" xmlns="http://www.w3.org/2000/svg" aria-label="Check engine">
-  <rect x="10" y="20" width="44" height="26" rx="6" fill="{c}" opacity="0.16"/>
-  <path d="M22 22h20c3 0 6 3 6 6v12c0 3-3 6-6 6H22c-3 0-6-3-6-6V28c0-3 3-6 6-6z" fill="{c}"/>
-  <path d="M18 30h-6v10h6" fill="{c}"/>
-  <path d="M52 30h6v10h-6" fill="{c}"/>
-  <rect x="26" y="28" width="12" height="12" rx="2" fill="white" opacity="0.92"/>
-  <path d="M26 18h12v4H26z" fill="{c}"/>
-  <path d="M28 46h8v4h-8z" fill="{c}"/>
-</svg>
-"""
-
-
-def dots_html(active_idx: int, n: int) -> str:
-    dots = []
-    for i in range(n):
-        cls = "dot active" if i == active_idx else "dot"
-        dots.append(f'<div class="{cls}"></div>')
-    return '<div class="dots">' + "".join(dots) + "</div>"
-
-
-def health_curve_points():
-    # y-scale: Fit ~3, Functional ~2, Frail ~1
-    # Tuned so ~55 is near the functional/frail boundary.
-    return [
-        (0, 2.92),
-        (10, 2.92),
-        (25, 2.70),
-        (40, 2.35),
-        (55, 2.06),
-        (65, 1.85),
-        (77, 1.62),
-        (92, 1.22),
-    ]
-
-
-def build_health_fig(x_end: float):
-    pts = health_curve_points()
-
-    # Build red segment (0 -> x_end) by clipping curve
-    xs, ys = [], []
-    for (x, y) in pts:
-        if x <= x_end:
-            xs.append(x)
-            ys.append(y)
-        else:
-            break
-
-    # End exactly at x_end via interpolation
-    if x_end > xs[-1]:
-        next_idx = len(xs)
-        if next_idx < len(pts):
-            x0, y0 = xs[-1], ys[-1]
-            x1, y1 = pts[next_idx]
-            if x1 != x0 and x_end < x1:
-                t = (x_end - x0) / (x1 - x0)
-                xs.append(x_end)
-                ys.append(y0 + t * (y1 - y0))
-
-    fig = go.Figure()
-
-    fig.add_trace(
-        go.Scatter(
-            x=xs,
-            y=ys,
-            mode="lines",
-            line=dict(color="#d11a1a", width=6, shape="spline", smoothing=0.7),
-            hoverinfo="skip",
-            name="Health",
-        )
-    )
+def deep_link_idx() -> int:
+    band = query_float("band")
+    if band is not None:
+        return clamp(int(band) - 1, 0, len(deck.bands) - 1)
+    age = query_float("age")
+    if age is not None:
+        return deck.band_for_age(age)
+    return 0
 
-    tickvals = [0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 77, 80, 85, 90, 92]
-    ticktext = [str(v) for v in tickvals]  # SAFE: no HTML here
 
-    fig.update_layout(
-        height=420,
-        margin=dict(l=10, r=10, t=10, b=46),
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        showlegend=False,
-        font=dict(color="rgba(0,0,0,0.55)"),
-    )
+# -------------------------
+# Client-side navigation (?nav=client)
+# -------------------------
+# Ships every band's card markup plus one chart with an animation frame per
+# band to the browser once. Previous/Next and dot clicks then swap content and
+# animate to the band's frame in the iframe; the component
+# only reports the index back (debounced) so it can be saved in session state.
+deck_nav = components.declare_component("lrp_deck", path=str(Path(__file__).parent / "frontend"))
+
+
+@st.cache_resource(max_entries=8)
+def client_deck_payload(deck_id: str, version: int) -> dict:
+    # version: bumped whenever the deck hot-reloads from its source document
+    from plotly.offline import get_plotlyjs_version
+
+    deck = get_deck(deck_id)
+    return {
+        "stylesheet": stylesheet_url() if static_assets_ready() else None,
+        "css": None if static_assets_ready() else APP_CSS,
+        "plotlyjs": f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js",
+        "figure": deck.frames_figure()["fig"],
+        "transition": FRAME_TRANSITION,
+        "dictionary": deck.dictionary_html,
+        "bands": deck.html,
+    }
 
-    fig.update_xaxes(
-        range=[0, 92],
-        tickmode="array",
-        tickvals=tickvals,
-        ticktext=ticktext,
-        title=dict(text="Age", font=dict(size=14, color="rgba(0,0,0,0.55)")),
-        showgrid=False,
-        showline=True,
-        linewidth=1,
-        linecolor="rgba(0,0,0,0.24)",
-        ticks="outside",
-        tickfont=dict(size=12, color="rgba(0,0,0,0.55)"),
-    )
 
-    fig.update_yaxes(
-        range=[0.9, 3.1],
-        tickmode="array",
-        tickvals=[3, 2, 1],
-        ticktext=["Fit", "Functional", "Frail"],
-        showgrid=True,
-        gridcolor="rgba(0,0,0,0.06)",
-        showline=True,
-        linewidth=1,
-        linecolor="rgba(0,0,0,0.24)",
-        ticks="",
-        tickfont=dict(size=13, color="rgba(0,0,0,0.55)"),
+# -------------------------
+# Chart element
+# -------------------------
+# st.plotly_chart turns whatever it is given back into a validated go.Figure
+# before serializing it. Deck figures are already final spec JSON, so they go
+# to the plotly_chart element as-is. Those are Streamlit internals: versions
+# without them fall back to the public API, and so does the whole process the
+# first time they don't fit (a changed signature).
+PLOT_CONFIG_JSON = json.dumps({"displayModeBar": False})
+
+try:
+    from streamlit.elements.lib.form_utils import current_form_id
+    from streamlit.elements.lib.layout_utils import LayoutConfig
+    from streamlit.elements.lib.utils import compute_and_register_element_id
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+except ImportError:
+    PlotlyChartProto = None
+
+
+@st.cache_resource
+def spec_internals() -> dict:
+    return {"usable": PlotlyChartProto is not None}
+
+
+def plot_spec(slot, payload: dict):
+    internals = spec_internals()
+    if internals["usable"]:
+        try:
+            enqueue_spec(slot, payload)
+            return
+        except (AttributeError, TypeError) as e:
+            internals["usable"] = False
+            logging.getLogger(__name__).warning("Charts fall back to st.plotly_chart: %s", e)
+    slot.plotly_chart(payload["fig"], width="stretch", config=json.loads(PLOT_CONFIG_JSON))
+
+
+def enqueue_spec(slot, payload: dict):
+    proto = PlotlyChartProto()
+    proto.spec = payload["json"]
+    proto.config = PLOT_CONFIG_JSON
+    proto.theme = "streamlit"
+    proto.form_id = current_form_id(slot)
+    proto.id = compute_and_register_element_id(
+        "plotly_chart",
+        user_key=None,
+        key_as_main_identity=False,
+        dg=slot,
+        plotly_spec=proto.spec,
+        plotly_config=proto.config,
     )
+    height = payload["fig"]["layout"]["height"]
+    slot._enqueue("plotly_chart", proto, layout_config=LayoutConfig(width="stretch", height=height))
 
-    # Emphasize 77 and 92 safely using annotations (HTML here is okay)
-    fig.add_annotation(x=77, y=0.92, text="<b>77</b>", showarrow=False, yshift=-18)
-    fig.add_annotation(x=92, y=0.92, text="<b>92</b>", showarrow=False, yshift=-18)
 
-    return fig
+# Low-bandwidth mode (?chart=svg): the chart arrives as server-rendered inline
+# SVG, so the browser never loads plotly.js. A personal overlay still needs
+# plotly (it has its own axis), so it switches that session back.
+chart_svg = st.query_params.get("chart") == "svg"
 
 
 # -------------------------
 # Navigation controls
 # -------------------------
 def prev():
-    st.session_state.idx = clamp(st.session_state.idx - 1, 0, len(BANDS) - 1)
+    st.session_state.idx = clamp(st.session_state.idx - 1, 0, len(deck.bands) - 1)
+    st.session_state.kiosk_shown_at = time.monotonic()
 
 
 def next_():
-    st.session_state.idx = clamp(st.session_state.idx + 1, 0, len(BANDS) - 1)
+    st.session_state.idx = clamp(st.session_state.idx + 1, 0, len(deck.bands) - 1)
+    st.session_state.kiosk_shown_at = time.monotonic()
+
+
+def jump_to(idx: int):
+    st.session_state.idx = idx
+    st.session_state.kiosk_shown_at = time.monotonic()
+    if "age" in st.session_state:
+        st.session_state.age = deck.bands[idx].a1
+
+
+def strip_clicked():
+    jump_to(clamp(st.session_state.thumb_strip["idx"], 0, len(deck.bands) - 1))
+
+
+# Thumbnail strip: a sparkline per band from the deck's sprite sheet; the
+# component only gets the sprite URL, labels and the current index, and
+# reports clicks back.
+thumb_strip = components.declare_component("lrp_strip", path=str(Path(__file__).parent / "frontend" / "strip"))
+
+
+def deck_changed():
+    st.session_state.idx = 0
+    st.session_state.pop("age", None)
 
 
 # -------------------------
-# Render
+# Presenter broadcast (?present=<token>, ?follow=1)
 # -------------------------
-b = BANDS[st.session_state.idx]
-
-# Top row: dictionary / nav / bullets
-col1, col2, col3 = st.columns([1.75, 0.85, 1.40], gap="large")
-
-with col1:
-    st.markdown(
-        f"""
-<div class="lrp-card">
-  <div class="lrp-title">{b["slide_title"]}</div>
-  <div class="lrp-dictword">
-    {b["word"]} <span class="lrp-pos">· {b["pos"]}</span>
-  </div>
-  <div class="lrp-phon">{b["phon"]}</div>
-
-  <div class="lrp-def"><span class="lrp-defnum">1)</span> {b["def1"]}</div>
-  <div class="lrp-def"><span class="lrp-defnum">2)</span> {b["def2"]}</div>
-</div>
-""",
-        unsafe_allow_html=True,
-    )
+# The presenter's session publishes its deck and band to the process-wide hub
+# (broadcast.py). Followers check the hub's version each time their band
+# fragment polls and jump when it moves, so a change reruns only that
+# fragment (another deck reruns the page). They have no navigation of their
+# own and render only the deck's shared prebuilt payloads (no cohort, no
+# overlay). Under serve.py, ?nav=client followers hold the whole deck in the
+# browser and long-poll the hub instead, so following costs the server no
+# reruns at all; only another deck goes back to the server.
+FOLLOW_POLL_S = 1.0
+FOLLOW_RETRY_MS = 2000  # a client-side follower whose long poll failed tries again after this
+
+if "presenting" not in st.session_state:
+    token = st.query_params.get("present")
+    st.session_state.presenting = token is not None and broadcast.check_token(token)
+    st.session_state.present_rejected = token is not None and not st.session_state.presenting
+    if token is not None:
+        del st.query_params["present"]  # keep the token out of the address bar and shared links
+presenting = st.session_state.presenting
+following = st.query_params.get("follow") == "1" and not presenting
+
+
+def follow_sync() -> bool:
+    # Adopt the presenter's deck and band if they moved since this session
+    # last looked; a poll that finds nothing new is one attribute read.
+    state = broadcast.HUB.state
+    if state.version == st.session_state.get("followed_version", 0) or state.deck_id not in DECKS:
+        return False
+    st.session_state.followed_version = state.version
+    st.session_state.deck_id = state.deck_id
+    st.session_state.idx = state.idx
+    return True
+
+
+def publish():
+    if presenting:
+        broadcast.HUB.publish(deck.id, st.session_state.idx)
+
 
-with col2:
-    st.markdown('<div class="lrp-card">', unsafe_allow_html=True)
-
-    cprev, cnext = st.columns(2)
-    with cprev:
-        st.button("◀ Previous", on_click=prev, use_container_width=True, disabled=(st.session_state.idx == 0))
-    with cnext:
-        st.button("Next ▶", on_click=next_, use_container_width=True, disabled=(st.session_state.idx == len(BANDS) - 1))
-
-    st.markdown(f'<div class="ages-label">Ages {b["a0"]}–{b["a1"]}</div>', unsafe_allow_html=True)
-    st.markdown(dots_html(st.session_state.idx, len(BANDS)), unsafe_allow_html=True)
-
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with col3:
-    bullets_html = "<ul>" + "".join([f"<li>{x}</li>" for x in b["bullets"]]) + "</ul>"
-    st.markdown(
-        f"""
-<div class="lrp-card">
-  <div class="lrp-heading">{b["heading"]}</div>
-  <div class="lrp-bullets">{bullets_html}</div>
-</div>
-""",
-        unsafe_allow_html=True,
+# -------------------------
+# Session state
+# -------------------------
+if following:
+    follow_sync()
+
+if len(DECKS) > 1 and not following:
+    st.sidebar.selectbox(
+        "Deck", list(DECKS), format_func=lambda d: DECKS[d]["page_title"], key="deck_id", on_change=deck_changed
     )
 
-# Bottom row: diagnosis/prescription/check-engine + plot
-left, right = st.columns([1.10, 2.90], gap="large")
-
-with left:
-    st.markdown(
-        f"""
-<div class="lrp-card">
-  <div class="lrp-label"><span class="lrp-ico">🩺</span><b>DIAGNOSIS</b></div>
-  <div class="lrp-body">{b["diagnosis"]}</div>
-
-  <div class="lrp-label" style="margin-top:12px;"><span class="lrp-ico">💊</span><b>PRESCRIPTION</b></div>
-  <div class="lrp-body">{b["prescription"]}</div>
-
-  <div class="lrp-label" style="margin-top:12px;"><span class="lrp-ico">🛠️</span><b>CHECK ENGINE</b></div>
-  <div style="margin-top:8px;">
-    {engine_svg(b["engine"])}
-  </div>
-</div>
-""",
-        unsafe_allow_html=True,
+deck = get_deck(st.session_state.deck_id)
+
+if "idx" not in st.session_state:
+    st.session_state.idx = deep_link_idx()
+# A hot-reloaded deck can have fewer bands than when the index was saved.
+st.session_state.idx = min(st.session_state.idx, len(deck.bands) - 1)
+# Clicks have moved the band already (callbacks run first), so followers hear
+# of it before this run renders; the scrubber and kiosk move it in band_view.
+publish()
+
+
+# -------------------------
+# Render
+# -------------------------
+def render_client_nav():
+    # The component only reads the deck on its first render, so another deck
+    # (or a reload of this one) gets a fresh instance, and with it a fresh
+    # saved index. A follower's instance reports only that the presenter
+    # switched decks, which the rerun has already picked up (follow_sync).
+    follow = None
+    if following:
+        follow = {
+            "url": broadcast.FOLLOW_ROUTE,
+            "retry_ms": FOLLOW_RETRY_MS,
+            "deck": deck.id,
+            "version": st.session_state.get("followed_version", 0),
+        }
+    saved = deck_nav(
+        deck=client_deck_payload(deck.id, deck.version),
+        idx=st.session_state.idx,
+        follow=follow,
+        key=f"deck_nav-{deck.id}-{deck.version}",
+        default=None,
     )
+    if saved is not None and not following:
+        st.session_state.idx = clamp(int(saved), 0, len(deck.bands) - 1)
+    publish()
+
+
+# -------------------------
+# Kiosk / autoplay (?kiosk=1&dwell=8)
+# -------------------------
+# Advances one band every `dwell` seconds, looping after the last one, by
+# re-running only the band fragment on a timer. While a band is on screen a
+# background worker warms everything the next band needs, so the advance is
+# a swap of ready payloads.
+KIOSK_DWELL_S = 8.0
+kiosk = st.query_params.get("kiosk") == "1" and st.query_params.get("nav") != "client" and not following
+dwell = clamp(query_float("dwell") or KIOSK_DWELL_S, 2.0, 600.0) if kiosk else None
+
+
+@st.cache_resource
+def prefetch_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="lrp-prefetch")
+
+
+def warm_band(deck, idx: int, cohort_params):
+    if chart_svg:
+        deck.svg_chart(deck.bands[idx].a1, cohort_params)
+    else:
+        deck.figure(deck.bands[idx].a1, cohort_params)
+
+
+def kiosk_advance():
+    # Every fragment run passes through here; only the timer's runs are due.
+    now = time.monotonic()
+    if now - st.session_state.setdefault("kiosk_shown_at", now) < dwell * 0.9:
+        return
+    pending = st.session_state.pop("kiosk_prefetch", None)
+    if pending is not None:
+        wait([pending])  # finish the warm-up rather than redo it
+    st.session_state.idx = (st.session_state.idx + 1) % len(deck.bands)
+    st.session_state.kiosk_shown_at = now
+
+
+def kiosk_prefetch():
+    nxt = (st.session_state.idx + 1) % len(deck.bands)
+    st.session_state.kiosk_prefetch = prefetch_pool().submit(warm_band, deck, nxt, cohort_params)
+
+
+scrub = st.query_params.get("scrub") == "1" and not kiosk and not following
+if scrub and "age" not in st.session_state:
+    age = query_float("age")
+    if age is None:
+        age = deck.bands[st.session_state.idx].a1
+    st.session_state.age = round(clamp(age, 0.0, AGE_MAX), 1)
+
 
-with right:
-    st.markdown('<div class="lrp-card plot-card">', unsafe_allow_html=True)
-    fig = build_health_fig(b["a1"])  # cumulative red segment only
-    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
-    st.markdown("</div>", unsafe_allow_html=True)
+# -------------------------
+# Search (sidebar)
+# -------------------------
+# Ranked hits from the deck's prebuilt index; each one jumps to its band.
+def search_sidebar():
+    query = st.sidebar.text_input("Search this deck", key="search_query", placeholder="e.g. caffeine, sleep")
+    if not query.strip():
+        return
+    hits = deck.search.search(query)
+    if not hits:
+        st.sidebar.caption("No matching bands.")
+    for hit in hits:
+        b = deck.bands[hit.idx]
+        st.sidebar.button(
+            f"Ages {b.a0}–{b.a1} · {b.heading}", key=f"search_hit_{hit.idx}", on_click=jump_to, args=(hit.idx,)
+        )
+        # Inside an HTML block, so the snippet's text isn't read as markdown
+        st.sidebar.markdown(f"<div>{hit.snippet}</div>", unsafe_allow_html=True)
+
+
+# -------------------------
+# Cohort simulation (sidebar)
+# -------------------------
+# Percentile band of a simulated cohort behind the red segment; each
+# parameter set is simulated once per deck (see Deck.cohort_band).
+def cohort_sidebar():
+    with st.sidebar.expander("Cohort simulation"):
+        if not st.toggle("Show 10–90th percentile band", key="cohort_on"):
+            return None
+        return CohortParams(
+            lives=st.select_slider("Synthetic lives", [10_000, 100_000, 250_000], value=100_000, key="cohort_lives"),
+            distribution=st.selectbox("Decline-rate distribution", DISTRIBUTIONS, key="cohort_distribution"),
+            spread=st.slider("Decline-rate spread", 0.0, 0.6, 0.25, step=0.05, key="cohort_spread"),
+            onset_sd=st.slider("Onset spread (years, sd)", 0.0, 10.0, 3.0, step=0.5, key="cohort_onset_sd"),
+        )
+
+
+# -------------------------
+# Wearable overlay (sidebar CSV upload)
+# -------------------------
+# The parsed and downsampled series is cached per file content hash, so
+# navigation reruns reuse it; each upload is only hashed once per session.
+@st.cache_data(max_entries=8, show_spinner="Reading export…")
+def wearable_overlay(digest: str, value: str, birth, _upload) -> dict:
+    return wearable.overlay_series(_upload, value, birth)
+
+
+def upload_digest(upload) -> str:
+    digests = st.session_state.setdefault("upload_digests", {})
+    if upload.file_id not in digests:
+        digests[upload.file_id] = hashlib.sha256(upload.getbuffer()).hexdigest()
+    return digests[upload.file_id]
+
+
+def overlay_sidebar():
+    upload = st.sidebar.file_uploader("Overlay your own data (CSV)", type="csv", key="overlay_file")
+    if upload is None:
+        return None
+
+    try:
+        header = wearable.read_header(upload)
+    except ValueError as e:
+        st.sidebar.error(str(e))
+        return None
+    columns = wearable.value_columns(header)
+    if not columns:
+        st.sidebar.error("The CSV needs a time column (age or date) and a value column.")
+        return None
+    value = st.sidebar.selectbox("Value", columns, key="overlay_value")
+    birth = None
+    if header[wearable.time_column(header)].lower() not in wearable.AGE_COLUMNS:
+        birth = st.sidebar.date_input(
+            "Date of birth", value=date(1980, 1, 1), min_value=date(1900, 1, 1), key="overlay_birth"
+        )
+
+    try:
+        series = wearable_overlay(upload_digest(upload), value, birth, upload)
+    except ValueError as e:
+        st.sidebar.error(str(e))
+        return None
+    st.sidebar.caption(f"{series['rows']:,} rows, drawn as {len(series['x']):,} points")
+    return series, value
+
+
+# Everything that depends on idx lives in one fragment, so Previous/Next, the
+# scrubber or the kiosk timer rerun only that fragment. The CSS, the column
+# layout and the dictionary card (the same for every band of a deck) are left
+# untouched; the fragment fills the idx-dependent slots it is handed.
+# Followers poll the presenter from here; every poll refills the slots (a
+# fragment rerun drops whatever it doesn't write again), from the deck's
+# prebuilt payloads.
+@st.fragment(run_every=FOLLOW_POLL_S if following else dwell)
+@perf.timed("band_view")
+def band_view(bullets_slot, diagnosis_slot, plot_slot):
+    if following and follow_sync() and st.session_state.deck_id != deck.id:
+        st.rerun()  # another deck: new dictionary card and layout
+    if kiosk:
+        kiosk_advance()
+
+    # Continuous age scrubber (?scrub=1): the slider drives both the band text
+    # and the end of the red segment.
+    if scrub:
+        st.session_state.idx = deck.band_for_age(st.session_state.age)
+
+    b = deck.bands[st.session_state.idx]
+    cards = deck.html[st.session_state.idx]
+    x_end = st.session_state.age if scrub else b.a1
+
+    with perf.span("col2"):
+        st.markdown('<div class="lrp-card">', unsafe_allow_html=True)
+
+        if following:
+            pass  # the presenter navigates
+        elif scrub:
+            st.slider("Age", 0.0, float(AGE_MAX), step=LUT_STEP, format="%.1f", key="age")
+        else:
+            cprev, cnext = st.columns(2)
+            with cprev:
+                st.button("◀ Previous", on_click=prev, use_container_width=True, disabled=(st.session_state.idx == 0))
+            with cnext:
+                st.button("Next ▶", on_click=next_, use_container_width=True, disabled=(st.session_state.idx == len(deck.bands) - 1))
+
+        st.markdown(cards["ages"], unsafe_allow_html=True)
+        sprite = None if following else static_url(deck.sparks_file, deck.sparks_svg)
+        if sprite is None:
+            st.markdown(dots_html(st.session_state.idx, len(deck.bands)), unsafe_allow_html=True)
+        else:
+            thumb_strip(
+                sprite=sprite,
+                labels=deck.strip_labels,
+                idx=st.session_state.idx,
+                key="thumb_strip",
+                on_change=strip_clicked,
+                default=None,
+            )
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with perf.span("col3"):
+        bullets_slot.markdown(cards["bullets"], unsafe_allow_html=True)
+    with perf.span("left"):
+        diagnosis_slot.markdown(cards["diagnosis"], unsafe_allow_html=True)
+    if chart_svg and overlay is None:
+        with perf.span("svg_chart"):
+            plot_slot.markdown(deck.svg_chart(x_end, cohort_params), unsafe_allow_html=True)
+    else:
+        with perf.span("plotly_chart"):
+            payload = deck.figure(x_end, cohort_params)  # cumulative red segment only
+            if overlay is not None:
+                payload = overlay_payload(payload, *overlay)
+            plot_spec(plot_slot, payload)
+
+    if kiosk:
+        kiosk_prefetch()
+    publish()  # no-op unless the scrubber or kiosk moved the band
+
+
+def render_deck():
+    # Top row: dictionary / nav / bullets
+    col1, col2, col3 = st.columns([1.75, 0.85, 1.40], gap="large")
+
+    # Bottom row: diagnosis/prescription/check-engine + plot
+    left, right = st.columns([1.10, 2.90], gap="large")
+
+    with col1, perf.span("col1"):
+        st.markdown(deck.dictionary_html, unsafe_allow_html=True)
+
+    with right:
+        st.markdown('<div class="lrp-card plot-card">', unsafe_allow_html=True)
+        plot_slot = st.empty()
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with col2:
+        band_view(col3.empty(), left.empty(), plot_slot)
+
+
+with perf.span("rerun"), perf.profiled(st.query_params.get("profile") == "1") as profile:
+    with perf.span("css"):
+        kiosk_css = f"<style>{KIOSK_CSS}</style>" if kiosk else ""
+        st.markdown(page_css() + kiosk_css, unsafe_allow_html=True)
+
+    if st.session_state.present_rejected:
+        st.sidebar.error("Presenter token not accepted.")
+    elif presenting:
+        st.sidebar.caption("Presenting: sessions opened with `?follow=1` follow your band.")
+
+    if st.query_params.get("nav") == "client" and (not following or broadcast.HUB.long_polled):
+        render_client_nav()
+    elif following:
+        cohort_params = overlay = None
+        render_deck()
+    else:
+        with perf.span("sidebar"):
+            search_sidebar()
+            cohort_params = cohort_sidebar()
+            overlay = overlay_sidebar()
+        render_deck()
+
+
+# -------------------------
+# Debug panel (?debug=1) / profile (?profile=1)
+# -------------------------
+if st.query_params.get("debug") == "1":
+    with st.expander("Timings (this process, recent reruns)"):
+        st.table(perf.summary())
+
+if profile.profile is not None:
+    with st.expander("Profile of this rerun", expanded=True):
+        st.download_button("Download .prof", profile.dump(), file_name="rerun.prof")
+        st.code(profile.text())
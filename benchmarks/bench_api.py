@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# =========================
+# JSON API THROUGHPUT
+# =========================
+# Starts api.py (one uvicorn worker, so one core) unless --url points at a
+# running one, then keeps --connections keep-alive HTTP/1.1 connections busy
+# with a mix of /band, /curve and /figure requests (gzip accepted, a share of
+# them revalidating with If-None-Match) and reports requests/s and latency.
+#
+#   python benchmarks/bench_api.py --connections 32 --duration 10
+
+PATHS = ("/band?age={band_age}", "/curve?until={age}", "/figure/{idx}")
+BANDS_END = 77  # the default deck's last band; /band is a 404 past it
+
+
+def request_bytes(path: str, etag: str | None) -> bytes:
+    lines = [f"GET {path} HTTP/1.1", "Host: bench", "Accept-Encoding: gzip"]
+    if etag:
+        lines.append(f"If-None-Match: {etag}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+async def read_response(reader) -> tuple:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length, etag = 0, None
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-length":
+            length = int(value)
+        elif name == b"etag":
+            etag = value.strip().decode()
+    if length:
+        await reader.readexactly(length)
+    return status, etag
+
+
+async def connection(host: str, port: int, stop_at: float, revalidate: float, latencies: list, statuses: dict):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    rng = random.Random()
+    try:
+        while time.perf_counter() < stop_at:
+            path = rng.choice(PATHS).format(
+                age=round(rng.uniform(0, 92), 1), band_age=round(rng.uniform(0, BANDS_END), 1), idx=rng.randrange(16)
+            )
+            etag = etags.get(path) if rng.random() < revalidate else None
+            t0 = time.perf_counter()
+            writer.write(request_bytes(path, etag))
+            status, new_etag = await read_response(reader)
+            latencies.append(time.perf_counter() - t0)
+            statuses[status] = statuses.get(status, 0) + 1
+            if new_etag:
+                etags[path] = new_etag
+    finally:
+        writer.close()
+
+
+async def run(host: str, port: int, connections: int, duration: float, revalidate: float) -> dict:
+    latencies, statuses = [], {}
+    t0 = time.perf_counter()
+    await asyncio.gather(
+        *(connection(host, port, t0 + duration, revalidate, latencies, statuses) for _ in range(connections))
+    )
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "connections": connections,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+        "statuses": statuses,
+    }
+
+
+def wait_ready(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url + "/decks", timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"API did not come up at {url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput benchmark for api.py.")
+    parser.add_argument("--url", help="benchmark a running API instead of starting one")
+    parser.add_argument("--port", type=int, default=8699, help="port for the API this starts")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--revalidate", type=float, default=0.3, help="share of requests sent with If-None-Match")
+    parser.add_argument("--out", help="also write results to this JSON file")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen([sys.executable, str(ROOT / "api.py"), "--port", str(args.port)])
+    try:
+        wait_ready(url)
+        host, _, port = url.removeprefix("http://").rstrip("/").partition(":")
+        result = asyncio.run(run(host, int(port or 80), args.connections, args.duration, args.revalidate))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(json.dumps(result, indent=2))
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
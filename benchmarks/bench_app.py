@@ -0,0 +1,196 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import charts  # noqa: E402
+from decks import DEFAULT_DECK, get_deck  # noqa: E402
+
+# =========================
+# RERUN BENCHMARK
+# =========================
+# Drives app.py headlessly with Streamlit's AppTest, clicking Next through
+# every band, and records:
+#
+#   - cold import/deck load and cold first script run (fresh interpreter)
+#   - script-run wall time per navigation click
+#   - time spent in charts.build_health_fig (uncached, and during navigation)
+#   - serialized figure and markdown payload sizes
+#
+#   python benchmarks/bench_app.py                     # compare to baseline
+#   python benchmarks/bench_app.py --update-baseline   # record a new baseline
+#
+# Results go to a JSON file; any metric that regresses past its tolerance
+# against the stored baseline fails the run (exit code 1).
+
+APP = str(ROOT / "app.py")
+BASELINE = Path(__file__).parent / "baseline.json"
+
+# Allowed growth over the baseline before a metric counts as a regression
+TIME_TOLERANCE = 0.25
+BYTES_TOLERANCE = 0.02
+
+COLD_IMPORT = """
+import sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import decks
+decks.get_deck()
+print(time.perf_counter() - t0)
+"""
+
+COLD_RUN = """
+import time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+AppTest.from_file({app!r}, default_timeout=120).run()
+print(time.perf_counter() - t0)
+"""
+
+
+def cold_seconds(code: str, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        runs.append(float(out.stdout.strip().splitlines()[-1]))
+    return min(runs)
+
+
+class Timed:
+    # Wraps a function, accumulating call count and wall time.
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+        self.seconds = 0.0
+
+    def __call__(self, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return self.fn(*args, **kwargs)
+        finally:
+            self.calls += 1
+            self.seconds += time.perf_counter() - t0
+
+
+def markdown_bytes(at) -> int:
+    return sum(len(el.value.encode("utf-8")) for el in at.markdown)
+
+
+def plotly_spec_bytes(at) -> int:
+    return sum(len(el.proto.spec.encode("utf-8")) for el in at.get("plotly_chart"))
+
+
+def next_button(at):
+    for button in at.button:
+        if "Next" in button.label and not button.disabled:
+            return button
+    return None
+
+
+def run_benchmark(repeat: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    deck = get_deck(DEFAULT_DECK)
+
+    build_ms = []
+    for band in deck.bands:
+        t0 = time.perf_counter()
+        charts.build_health_fig(deck.lut, band.a1)
+        build_ms.append((time.perf_counter() - t0) * 1000)
+    figure_bytes = [len(deck.figure(band.a1)["json"].encode("utf-8")) for band in deck.bands]
+
+    timed_build = Timed(charts.build_health_fig)
+    charts.build_health_fig = timed_build
+    try:
+        nav_ms, md_bytes, spec_bytes = [], [], []
+        for _ in range(repeat):
+            at = AppTest.from_file(APP, default_timeout=120).run()
+            while True:
+                button = next_button(at)
+                if button is None:
+                    break
+                t0 = time.perf_counter()
+                button.click().run()
+                nav_ms.append((time.perf_counter() - t0) * 1000)
+                if at.exception:
+                    raise RuntimeError(at.exception[0].message)
+                md_bytes.append(markdown_bytes(at))
+                spec_bytes.append(plotly_spec_bytes(at))
+    finally:
+        charts.build_health_fig = timed_build.fn
+
+    nav_sorted = sorted(nav_ms)
+    return {
+        "cold_import_s": cold_seconds(COLD_IMPORT.format(root=str(ROOT)), repeat),
+        "cold_first_run_s": cold_seconds(COLD_RUN.format(app=APP), repeat),
+        "nav_run_ms_p50": statistics.median(nav_ms),
+        "nav_run_ms_p90": nav_sorted[int(0.9 * (len(nav_sorted) - 1))],
+        "nav_run_ms_max": nav_sorted[-1],
+        "nav_clicks": len(nav_ms),
+        "build_health_fig_ms_mean": statistics.mean(build_ms),
+        "build_health_fig_calls_during_nav": timed_build.calls,
+        "build_health_fig_ms_during_nav": timed_build.seconds * 1000,
+        "figure_json_bytes_max": max(figure_bytes),
+        "figure_json_bytes_total": sum(figure_bytes),
+        "plotly_spec_bytes_mean": statistics.mean(spec_bytes),
+        "markdown_bytes_mean": statistics.mean(md_bytes),
+    }
+
+
+def tolerance(metric: str):
+    if "bytes" in metric:
+        return BYTES_TOLERANCE
+    if metric.endswith("_s") or "_ms" in metric:
+        return TIME_TOLERANCE
+    return None  # counters: reported, not gated
+
+
+def compare(results: dict, baseline: dict):
+    regressions = []
+    for metric, value in results.items():
+        tol = tolerance(metric)
+        base = baseline.get(metric)
+        if tol is None or base is None:
+            continue
+        # Tiny absolute values (e.g. 0 ms when cached) only regress past 1 unit.
+        if value > base * (1 + tol) and value - base > 1:
+            regressions.append(f"{metric}: {value:.3f} vs baseline {base:.3f} (+{tol:.0%} allowed)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app.py navigation reruns.")
+    parser.add_argument("--out", default="bench_results.json", help="where to write results (JSON)")
+    parser.add_argument("--baseline", default=str(BASELINE), help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--repeat", type=int, default=3, help="full walks / cold starts to sample")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.repeat)
+    Path(args.out).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    for metric, value in sorted(results.items()):
+        print(f"{metric:36} {value:12.3f}")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one.")
+        return 0
+
+    regressions = compare(results, json.loads(baseline_path.read_text()))
+    for line in regressions:
+        print("REGRESSION", line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
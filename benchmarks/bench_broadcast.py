@@ -0,0 +1,385 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import resource
+import secrets
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pyarrow as pa
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import perf  # noqa: E402
+from decks import DEFAULT_DECK, get_deck  # noqa: E402
+
+# =========================
+# PRESENTER FAN-OUT LOAD TEST
+# =========================
+# Starts serve.py under `streamlit run` (one server process) and drives it over
+# Streamlit's websocket with the same messages a browser sends: one presenter
+# session (?present=<token>) clicking Next/Previous, and N follower sessions.
+# --followers are ?follow=1 sessions that rerun the band fragment each time its
+# auto-rerun timer fires, as the frontend does; --client-followers are
+# ?follow=1&nav=client sessions that load the deck once and then keep a long
+# poll on serve.py's follower route open, as the component does.
+#
+# Reports, per follower count:
+#   delivery  presenter clicks -> follower has the new band, per follower and
+#             for the last follower of each change (includes the presenter's
+#             own rerun, which publishes before it renders)
+#   idle      with the presenter still, polls and script runs per second and
+#             the server CPU each follower costs
+#   figure builds in the server during the load (?debug=1 timings), which
+#             must stay 0: followers only read shared payloads
+#
+# Fails if a follower misses a change, a figure is built, or a change takes
+# longer than DELIVERY_S + FAN_OUT_SLACK_MS to reach every follower.
+# Server and clients share this machine, so on few cores the clients' own
+# CPU shows up in the latencies too.
+#
+#   python benchmarks/bench_broadcast.py --followers 50 100 --client-followers 500
+
+DELIVERY_S = 1.0  # "within about a second": the band fragment's poll interval
+FAN_OUT_SLACK_MS = 500
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def rerun_msg(query: str, fragment_id: str = "", trigger: str = "") -> bytes:
+    msg = BackMsg()
+    msg.rerun_script.query_string = query
+    if fragment_id:
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.is_auto_rerun = True
+    if trigger:
+        widget = msg.rerun_script.widget_states.widgets.add()
+        widget.id, widget.trigger_value = trigger, True
+    return msg.SerializeToString()
+
+
+def elements(raw: bytes):
+    # (element type, element) for a new element, else (message type, message)
+    msg = ForwardMsg()
+    msg.ParseFromString(raw)
+    kind = msg.WhichOneof("type")
+    if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+        element = msg.delta.new_element
+        return element.WhichOneof("type"), element
+    return kind, msg
+
+
+class Session:
+    def __init__(self, url: str, query: str):
+        self.url, self.query = url, query
+
+    async def __aenter__(self):
+        self.ws = await websockets.connect(
+            f"{self.url}/_stcore/stream", subprotocols=["streamlit"], max_size=None, ping_interval=None
+        )
+        await self.ws.send(rerun_msg(self.query))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.ws.close()
+
+    async def until(self, kind: str):
+        async for raw in self.ws:
+            kind_, obj = elements(raw)
+            if kind_ == kind:
+                return obj
+
+
+class Presenter(Session):
+    # Walks the deck with the Previous/Next buttons, turning at either end
+    def __init__(self, url: str, token: str, ages: dict):
+        super().__init__(url, f"present={token}")
+        self.ages, self.buttons, self.forward = ages, {}, True
+
+    async def __aenter__(self):
+        await super().__aenter__()
+        await self.render()
+        return self
+
+    async def render(self) -> int:
+        # The band index the rerun in flight shows
+        idx = None
+        async for raw in self.ws:
+            kind, obj = elements(raw)
+            if kind == "markdown" and obj.markdown.body in self.ages:
+                idx = self.ages[obj.markdown.body]
+            elif kind == "button":
+                self.buttons["next" if "Next" in obj.button.label else "prev"] = obj.button
+            elif kind == "script_finished":
+                return idx
+        raise ConnectionError("the presenter's session closed")
+
+    async def step(self) -> tuple:
+        # (band index, when it was clicked)
+        if self.buttons["next" if self.forward else "prev"].disabled:
+            self.forward = not self.forward
+        button = self.buttons["next" if self.forward else "prev"]
+        clicked = time.perf_counter()
+        await self.ws.send(rerun_msg("", trigger=button.id))
+        return await self.render(), clicked
+
+
+class Follower:
+    path = "fragment"
+
+    def __init__(self, url: str, ages: dict):
+        self.url, self.ages = url, ages  # ages: band markup -> band index
+        self.received = []  # (band index, perf_counter) as band markup arrives
+        self.runs = self.polls = 0  # script runs finished (full and fragment), polls sent
+        self.fragment_id, self.interval = "", None
+
+    async def run(self, ready):
+        timer = None
+        try:
+            async with Session(self.url, "follow=1") as session:
+                async for raw in session.ws:
+                    kind, obj = elements(raw)
+                    if kind == "markdown" and obj.markdown.body in self.ages:
+                        self.received.append((self.ages[obj.markdown.body], time.perf_counter()))
+                    elif kind == "auto_rerun":
+                        self.fragment_id, self.interval = obj.auto_rerun.fragment_id, obj.auto_rerun.interval
+                    elif kind == "script_finished":
+                        self.runs += 1
+                        if timer is None and self.fragment_id:
+                            timer = asyncio.create_task(self.poll(session.ws))
+                            ready.release()
+        finally:
+            if timer is None:
+                ready.release()  # never got going; its changes count as missed
+            else:
+                timer.cancel()
+
+    async def poll(self, ws):
+        # The frontend's run_every timer: rerun only the follower fragment.
+        # Browsers open at different moments, so the timers aren't in step.
+        await asyncio.sleep(random.uniform(0, self.interval))
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await ws.send(rerun_msg("follow=1", self.fragment_id))
+            except websockets.ConnectionClosed:
+                return
+            self.polls += 1
+
+
+class ClientFollower(Follower):
+    # One script run for the deck payload; after that the session stays open
+    # but idle while the browser long-polls the presenter.
+    path = "client"
+
+    async def run(self, ready):
+        timer, follow = None, None
+        try:
+            async with Session(self.url, "follow=1&nav=client") as session:
+                async for raw in session.ws:
+                    kind, obj = elements(raw)
+                    if kind == "component_instance":
+                        follow = json.loads(obj.component_instance.json_args)["follow"]
+                    elif kind == "script_finished":
+                        self.runs += 1
+                        if timer is None and follow:
+                            timer = asyncio.create_task(self.poll(follow))
+                            ready.release()
+        finally:
+            if timer is None:
+                ready.release()
+            else:
+                timer.cancel()
+
+    async def poll(self, follow):
+        # The component's long poll: one request in flight, sent again as soon
+        # as it is answered
+        known = follow["version"]
+        server = urlsplit(self.url)
+        reader, writer = await asyncio.open_connection(server.hostname, server.port)
+        try:
+            while True:
+                writer.write(f"GET {follow['url']}?version={known} HTTP/1.1\r\nHost: {server.netloc}\r\n\r\n".encode())
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(re.search(rb"(?i)\r\ncontent-length: *(\d+)", head)[1])
+                state = json.loads(await reader.readexactly(length))
+                self.polls += 1
+                if state["version"] != known:
+                    known = state["version"]
+                    self.received.append((state["idx"], time.perf_counter()))
+        finally:
+            writer.close()
+
+
+def server_cpu_s(pid: int):
+    # User + system CPU seconds of the server process (Linux /proc), or None
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+async def figure_builds(url: str) -> int:
+    # The server's build_health_fig count, from the ?debug=1 timings table
+    async with Session(url, "follow=1&debug=1") as session:
+        table = await session.until("table")
+        await session.until("script_finished")
+    rows = pa.ipc.open_stream(table.table.arrow_data.data).read_all().to_pylist()
+    return next((row["count"] for row in rows if row["span"] == "build_health_fig"), 0)
+
+
+async def run_level(
+    url: str, pid: int, token: str, n: int, follower, changes: int, interval: float, idle: float
+) -> dict:
+    deck = get_deck(DEFAULT_DECK)
+    ages = {cards["ages"]: i for i, cards in enumerate(deck.html)}
+    builds_before = await figure_builds(url)
+
+    async with Presenter(url, token, ages) as presenter:
+        ready = asyncio.Semaphore(0)
+        followers = [follower(url, ages) for _ in range(n)]
+        tasks = [asyncio.create_task(f.run(ready)) for f in followers]
+        for _ in followers:
+            await ready.acquire()
+
+        # Idle: everyone polls, nothing changes
+        await asyncio.sleep(2 * (followers[0].interval or 0))  # every poll timer running
+        runs0, polls0 = sum(f.runs for f in followers), sum(f.polls for f in followers)
+        cpu0, t0 = server_cpu_s(pid), time.perf_counter()
+        await asyncio.sleep(idle)
+        runs1, polls1 = sum(f.runs for f in followers), sum(f.polls for f in followers)
+        cpu1, t1 = server_cpu_s(pid), time.perf_counter()
+
+        published = []  # (band index, clicked at)
+        for _ in range(changes):
+            published.append(await presenter.step())
+            await asyncio.sleep(interval)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    latencies, complete, missed = [], [], 0
+    for k, (idx, at) in enumerate(published):
+        until = published[k + 1][1] if k + 1 < len(published) else math.inf
+        change = []
+        for f in followers:
+            got = next((t for i, t in f.received if i == idx and at <= t < until), None)
+            if got is None:
+                missed += 1
+            else:
+                change.append((got - at) * 1000)
+        latencies.extend(change)
+        if len(change) == n:
+            complete.append(max(change))
+    latencies.sort()
+    complete.sort()
+
+    idle_cpu = None if cpu0 is None else (cpu1 - cpu0) / (t1 - t0)
+    return {
+        "followers": n,
+        "path": follower.path,
+        "changes": changes,
+        "poll_s": followers[0].interval,
+        "missed": missed,
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+        "p99_ms": round(perf.percentile(latencies, 0.99), 1) if latencies else None,
+        "all_followers_p50_ms": round(statistics.median(complete), 1) if complete else None,
+        "all_followers_max_ms": round(complete[-1], 1) if complete else None,
+        "idle_polls_per_s": round((polls1 - polls0) / (t1 - t0), 1),
+        "idle_script_runs_per_s": round((runs1 - runs0) / (t1 - t0), 1),
+        "idle_server_cpu_pct": None if idle_cpu is None else round(idle_cpu * 100, 1),
+        "idle_server_cpu_ms_per_follower_s": None if idle_cpu is None else round(idle_cpu * 1000 / n, 2),
+        "figure_builds_during_load": await figure_builds(url) - builds_before,
+    }
+
+
+def wait_ready(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url + "/_stcore/health", timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"Streamlit did not come up at {url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Presenter -> follower fan-out load test against a Streamlit server.")
+    parser.add_argument(
+        "--followers", type=int, nargs="*", default=[50, 100], help="?follow=1 (band fragment) follower counts to run"
+    )
+    parser.add_argument(
+        "--client-followers", type=int, nargs="*", default=[500], help="?follow=1&nav=client follower counts to run"
+    )
+    parser.add_argument("--changes", type=int, default=8, help="band changes the presenter makes")
+    parser.add_argument("--interval", type=float, default=3.0, help="seconds between changes (a presenter's pace)")
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds of idle polling to measure")
+    parser.add_argument("--port", type=int, default=8698, help="port for the Streamlit server this starts")
+    parser.add_argument("--out", help="also write results to this JSON file")
+    args = parser.parse_args()
+
+    # A socket or two per follower, in this process and the server's
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    token = secrets.token_urlsafe(16)
+    url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", str(ROOT / "serve.py"),
+            "--server.headless", "true",
+            "--server.port", str(args.port),
+            "--server.fileWatcherType", "none",  # as deployed for an audience; see README
+            "--server.enableXsrfProtection", "false",  # the test clients carry no XSRF cookie
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT,
+        env={**os.environ, "LRP_PRESENTER_TOKEN": token},
+        stdout=subprocess.DEVNULL,
+    )
+    results = []
+    try:
+        wait_ready(url)
+        ws_url = url.replace("http://", "ws://")
+        levels = [(n, Follower) for n in args.followers] + [(n, ClientFollower) for n in args.client_followers]
+        for n, follower in levels:
+            result = asyncio.run(
+                run_level(ws_url, server.pid, token, n, follower, args.changes, args.interval, args.idle)
+            )
+            results.append(result)
+            print(json.dumps(result))
+    finally:
+        server.terminate()
+        server.wait()
+
+    failed = [
+        r for r in results
+        if r["missed"]
+        or r["figure_builds_during_load"]
+        or (r["all_followers_max_ms"] or math.inf) > DELIVERY_S * 1000 + FAN_OUT_SLACK_MS
+    ]
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2) + "\n")
+    if failed:
+        raise SystemExit(
+            f"{len(failed)} level(s) missed changes, built figures "
+            f"or took over {DELIVERY_S:g} s + {FAN_OUT_SLACK_MS} ms to fan out"
+        )
+
+
+if __name__ == "__main__":
+    main()
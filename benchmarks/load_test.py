@@ -0,0 +1,169 @@
+import argparse
+import gc
+import json
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import perf  # noqa: E402
+from decks import DEFAULT_DECK, get_deck  # noqa: E402
+
+# =========================
+# CONCURRENT SESSION LOAD TEST
+# =========================
+# Starts N simulated sessions of app.py in this process (Streamlit AppTest,
+# one thread each). Every session walks Previous/Next back and forth at a
+# fixed click rate. Reports per-rerun latency (p50/p99), throughput and the
+# memory each session adds (tracemalloc, while sessions start), and checks
+# that deck data (BANDS, figures, compiled markup) stays shared instead of
+# being rebuilt or copied per session.
+#
+#   python benchmarks/load_test.py --sessions 10 100 500 --rate 1 --duration 20
+
+APP = str(ROOT / "app.py")
+
+# Deck-level modules: allocations here while sessions start mean per-session copies.
+SHARED_SOURCES = ("charts.py", "render.py", "decks")
+SHARED_GROWTH_LIMIT = 256 * 1024
+
+# AppTest script runs aren't thread-safe, so sessions take turns executing
+# (as they would on the GIL anyway). Reported latency therefore includes the
+# time a click spends queued behind other sessions' reruns.
+RUN_LOCK = threading.Lock()
+
+
+def shared_bytes(snapshot) -> int:
+    total = 0
+    for stat in snapshot.statistics("filename"):
+        filename = stat.traceback[0].filename
+        if filename.startswith(str(ROOT)) and any(part in filename for part in SHARED_SOURCES):
+            total += stat.size
+    return total
+
+
+def nav_button(at, forward: bool):
+    label = "Next" if forward else "Previous"
+    for button in at.button:
+        if label in button.label:
+            return None if button.disabled else button
+    return None
+
+
+class Session(threading.Thread):
+    def __init__(self, at, rate: float, stop_at: float, barrier):
+        super().__init__(daemon=True)
+        self.at = at
+        self.interval = 1.0 / rate
+        self.stop_at = stop_at
+        self.barrier = barrier
+        self.latencies = []
+        self.error = None
+
+    def run(self):
+        forward = True
+        self.barrier.wait()
+        try:
+            while time.perf_counter() < self.stop_at:
+                started = time.perf_counter()
+                button = nav_button(self.at, forward)
+                if button is None:
+                    forward = not forward
+                    button = nav_button(self.at, forward)
+                if button is None:
+                    raise RuntimeError("No navigation button rendered")
+                with RUN_LOCK:
+                    button.click().run()
+                self.latencies.append((time.perf_counter() - started) * 1000)
+                if self.at.exception:
+                    raise RuntimeError(self.at.exception[0].message)
+                time.sleep(max(0.0, self.interval - (time.perf_counter() - started)))
+        except Exception as e:  # reported in the summary, not fatal to other sessions
+            self.error = e
+
+
+def build_count() -> int:
+    return next((row["count"] for row in perf.summary() if row["span"] == "build_health_fig"), 0)
+
+
+def run_level(n: int, rate: float, duration: float) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    get_deck(DEFAULT_DECK)  # warm the shared deck outside the measurement
+    # One throwaway session, so the first level's per-session memory doesn't
+    # include the app's imports and caches that every later session shares.
+    AppTest.from_file(APP, default_timeout=120).run()
+    builds_before = build_count()
+
+    # Memory is traced while sessions start (each does a full first run);
+    # tracing is off during the timed load so it doesn't skew latency.
+    tracemalloc.start()
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    sessions = [AppTest.from_file(APP, default_timeout=120).run() for _ in range(n)]
+    gc.collect()
+    after_start = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    barrier = threading.Barrier(n + 1)
+    stop_at = time.perf_counter() + duration + 0.5
+    threads = [Session(at, rate, stop_at, barrier) for at in sessions]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(ms for t in threads for ms in t.latencies)
+    errors = [repr(t.error) for t in threads if t.error]
+    session_bytes = sum(s.size_diff for s in after_start.compare_to(before, "filename"))
+    shared_growth = shared_bytes(after_start) - shared_bytes(before)
+
+    return {
+        "sessions": n,
+        "reruns": len(latencies),
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) if latencies else None,
+        "p99_ms": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] if latencies else None,
+        "bytes_per_session": session_bytes / n,
+        "shared_data_growth_bytes": shared_growth,
+        "figure_builds_during_load": build_count() - builds_before,
+        "shared": shared_growth < SHARED_GROWTH_LIMIT and build_count() == builds_before,
+        "errors": errors[:5],
+        "error_count": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for app.py.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 100, 500], help="session counts to run")
+    parser.add_argument("--rate", type=float, default=1.0, help="navigation clicks per second per session")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load per level")
+    parser.add_argument("--out", help="also write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for n in args.sessions:
+        result = run_level(n, args.rate, args.duration)
+        results.append(result)
+        print(
+            f"{n:5d} sessions  {result['throughput_rps']:8.1f} reruns/s  "
+            f"p50 {result['p50_ms'] or 0:8.1f} ms  p99 {result['p99_ms'] or 0:8.1f} ms  "
+            f"{result['bytes_per_session'] / 1024:8.1f} KiB/session  "
+            f"shared={'yes' if result['shared'] else 'NO'}  errors={result['error_count']}"
+        )
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2) + "\n")
+    return 0 if all(r["shared"] and not r["error_count"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import asyncio
+import hmac
+import os
+import threading
+from dataclasses import dataclass
+
+# =========================
+# PRESENTER BROADCAST
+# =========================
+# One process-wide hub holds where the presenter is (deck and band index).
+# The presenter's session publishes to it after every navigation; follower
+# sessions only compare the hub's version with the last one they rendered
+# and, when it moved, jump to the published band. Everything a follower then
+# renders comes from the deck's shared prebuilt payloads, so the cost of a
+# change is one small state object, not a figure per viewer.
+#
+# The state is an immutable record swapped under a lock, so a follower's check
+# is one attribute read, without locking. Under serve.py the hub also answers
+# long polls (wait) on the server's event loop, for followers that render the
+# deck in the browser: a publish wakes them all at once.
+#
+# Presenting requires the token in LRP_PRESENTER_TOKEN (?present=<token>);
+# without it set, nobody can present.
+PRESENTER_TOKEN = os.environ.get("LRP_PRESENTER_TOKEN", "")
+FOLLOW_ROUTE = "/follow"  # the long-poll route, see serve.py
+
+
+@dataclass(frozen=True, slots=True)
+class BroadcastState:
+    version: int = 0  # 0: nothing published yet
+    deck_id: str | None = None
+    idx: int = 0
+
+
+class Hub:
+    def __init__(self):
+        self.state = BroadcastState()
+        self._lock = threading.Lock()
+        self._loop = None  # the event loop answering long polls, once serving
+        self._changed = None  # asyncio.Event set by the next publish
+
+    def publish(self, deck_id: str, idx: int) -> BroadcastState:
+        # No-op (no new version) when the presenter is already there.
+        with self._lock:
+            state = self.state
+            if state.version and (state.deck_id, state.idx) == (deck_id, idx):
+                return state
+            self.state = new = BroadcastState(state.version + 1, deck_id, idx)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake)
+        return new
+
+    @property
+    def long_polled(self) -> bool:
+        return self._loop is not None
+
+    def serve_long_polls(self):
+        # Call on the event loop that will await wait()
+        self._changed = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self, version: int, timeout: float) -> BroadcastState:
+        # The state as soon as it is no longer `version` (at once if it isn't;
+        # a follower from before a restart may be ahead), or unchanged after
+        # `timeout` seconds.
+        changed = self._changed
+        if self.state.version == version:
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.state
+
+
+HUB = Hub()
+
+
+def check_token(token: str) -> bool:
+    if not PRESENTER_TOKEN:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), PRESENTER_TOKEN.encode("utf-8"))
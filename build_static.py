@@ -0,0 +1,207 @@
+import argparse
+import dataclasses
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from decks import DECKS, DEFAULT_DECK, deck_content, get_deck
+import render
+from render import APP_CSS, content_hash
+
+# =========================
+# STATIC SITE BUILD
+# =========================
+# Pre-renders every band of every registered deck to a standalone HTML page:
+#
+#   python build_static.py --out site
+#
+# The stylesheet, engine sprite and plotly.js are written once under assets/
+# with content-hashed names, so the whole site can sit behind any static file
+# server/CDN with long-lived caching. Pages whose inputs (band text, curve,
+# templates, asset names) are unchanged since the last build are skipped.
+
+ROOT = Path(__file__).parent
+SITE_ASSET_BASE = "../assets/"  # from a page in <out>/<deck>/
+TEMPLATE_SOURCES = ("build_static.py", "render.py", "charts.py")
+MANIFEST = ".manifest.json"
+
+# Replaces the Streamlit column layout on the static pages
+PAGE_CSS = """
+body { margin: 0; font-family: "Source Sans Pro", sans-serif; color: rgb(49, 51, 63); }
+.block-container { margin: 0 auto; padding-left: 1rem; padding-right: 1rem; }
+.lrp-row { display: grid; gap: 3rem; align-items: start; }
+.lrp-row.top { grid-template-columns: 1.75fr 0.85fr 1.40fr; }
+.lrp-row.bottom { grid-template-columns: 1.10fr 2.90fr; margin-top: 1rem; }
+.lrp-nav-buttons { display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem; }
+.lrp-nav-buttons > * {
+  padding: 0.5rem; text-align: center; color: inherit; text-decoration: none;
+  border: 1px solid rgba(49, 51, 63, 0.2); border-radius: 0.5rem;
+}
+.lrp-nav-buttons span { opacity: 0.4; }
+"""
+
+
+def page_name(idx: int) -> str:
+    return f"band-{idx + 1:02d}.html"
+
+
+def dot_links_html(active_idx: int, n: int) -> str:
+    dots = []
+    for i in range(n):
+        cls = "dot active" if i == active_idx else "dot"
+        dots.append(f'<a class="{cls}" href="{page_name(i)}" aria-label="Band {i + 1}"></a>')
+    return '<div class="dots">' + "".join(dots) + "</div>"
+
+
+def nav_link_html(label: str, idx: int, n: int) -> str:
+    if 0 <= idx < n:
+        return f'<a href="{page_name(idx)}">{label}</a>'
+    return f"<span>{label}</span>"
+
+
+def page_html(deck_id: str, idx: int, assets: dict) -> str:
+    deck = get_deck(deck_id)
+    b = deck.bands[idx]
+    cards = deck.html[idx]
+    n = len(deck.bands)
+    figure_json = deck.figure(b.a1)["json"]
+
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{deck.page_title} · Ages {b.a0}–{b.a1}</title>
+<link rel="stylesheet" href="../{assets["css"]}">
+<script src="../{assets["plotly"]}"></script>
+</head>
+<body>
+<div class="block-container">
+<div class="lrp-row top">
+{deck.dictionary_html}
+<div class="lrp-card">
+  <div class="lrp-nav-buttons">
+    {nav_link_html("◀ Previous", idx - 1, n)}
+    {nav_link_html("Next ▶", idx + 1, n)}
+  </div>
+  {cards["ages"]}
+  {dot_links_html(idx, n)}
+</div>
+{cards["bullets"]}
+</div>
+<div class="lrp-row bottom">
+{cards["diagnosis"]}
+<div class="lrp-card plot-card"><div id="plot"></div></div>
+</div>
+</div>
+<script>
+const fig = {figure_json};
+Plotly.newPlot("plot", fig.data, fig.layout, {{ displayModeBar: false, responsive: true }});
+</script>
+</body>
+</html>
+"""
+
+
+def redirect_html(href: str) -> str:
+    return f'<!doctype html><meta charset="utf-8"><meta http-equiv="refresh" content="0; url={href}"><a href="{href}">{href}</a>\n'
+
+
+def use_site_assets():
+    # Worker initializer: card markup compiled in the workers points at the
+    # engine sprite under the site's own assets/, not the app's static URL.
+    # Only the build's own processes are changed, never an importer's.
+    render.ASSET_BASE = SITE_ASSET_BASE
+
+
+def render_page(job):
+    # Runs in a worker process; each worker loads (and keeps) its own decks.
+    deck_id, idx, assets = job
+    return deck_id, idx, page_html(deck_id, idx, assets)
+
+
+# -------------------------
+# Build
+# -------------------------
+def write_assets(out: Path) -> dict:
+    from plotly.offline import get_plotlyjs
+
+    assets_dir = out / "assets"
+    assets_dir.mkdir(parents=True, exist_ok=True)
+
+    files = {
+        "css": ("lrp.{}.css", APP_CSS + PAGE_CSS),
+        "plotly": ("plotly.{}.min.js", get_plotlyjs()),
+        "sprite": ("engines.{}.svg", render.SPRITE_SVG),  # same name as render.SPRITE_FILE
+    }
+    assets = {}
+    for key, (pattern, text) in files.items():
+        name = pattern.format(content_hash(text)[:12])
+        path = assets_dir / name
+        if not path.exists():
+            path.write_text(text, encoding="utf-8")
+        assets[key] = f"assets/{name}"
+    return assets
+
+
+def page_inputs_hash(header, band, idx: int, n: int, curve, assets: dict, code_hash: str) -> str:
+    inputs = {
+        "header": dataclasses.asdict(header),
+        "band": dataclasses.asdict(band),
+        "idx": idx,
+        "n": n,
+        "curve": curve,
+        "assets": assets,
+        "code": code_hash,
+    }
+    return content_hash(json.dumps(inputs, sort_keys=True, ensure_ascii=False))
+
+
+def build(out: Path, deck_ids, jobs: int, force: bool = False):
+    out.mkdir(parents=True, exist_ok=True)
+    assets = write_assets(out)
+    code_hash = content_hash(b"".join((ROOT / name).read_bytes() for name in TEMPLATE_SOURCES))
+
+    manifest_path = out / MANIFEST
+    manifest = {} if force or not manifest_path.exists() else json.loads(manifest_path.read_text())
+
+    todo, skipped = [], 0
+    hashes = {}
+    for deck_id in deck_ids:
+        header, bands, curve = deck_content(deck_id)
+        (out / deck_id).mkdir(exist_ok=True)
+        (out / deck_id / "index.html").write_text(redirect_html(page_name(0)), encoding="utf-8")
+        for idx, band in enumerate(bands):
+            rel = f"{deck_id}/{page_name(idx)}"
+            hashes[rel] = page_inputs_hash(header, band, idx, len(bands), curve, assets, code_hash)
+            if manifest.get(rel) == hashes[rel] and (out / rel).exists():
+                skipped += 1
+            else:
+                todo.append((deck_id, idx, assets))
+
+    (out / "index.html").write_text(redirect_html(f"{DEFAULT_DECK}/index.html"), encoding="utf-8")
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=use_site_assets) as pool:
+            for deck_id, idx, html in pool.map(render_page, todo):
+                (out / deck_id / page_name(idx)).write_text(html, encoding="utf-8")
+
+    manifest_path.write_text(json.dumps(hashes, indent=2, sort_keys=True), encoding="utf-8")
+    return len(todo), skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render every deck band to static HTML.")
+    parser.add_argument("--out", default="site", help="output directory (default: site)")
+    parser.add_argument("--deck", action="append", choices=sorted(DECKS), help="deck to build (default: all)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="re-render every page")
+    args = parser.parse_args()
+
+    rendered, skipped = build(Path(args.out), args.deck or list(DECKS), args.jobs, args.force)
+    print(f"Rendered {rendered} page(s), {skipped} unchanged, into {args.out}/")
+
+
+if __name__ == "__main__":
+    main()
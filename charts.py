@@ -0,0 +1,384 @@
+import json
+from functools import lru_cache
+from html import escape
+
+import perf
+
+
+def clamp(v, lo, hi):
+    return max(lo, min(hi, v))
+
+
+# -------------------------
+# Curve lookup table
+# -------------------------
+# Plotly's shape="spline" draws a Catmull-Rom style Bezier path in *pixel*
+# space, so clipping the control points and re-splining puts the clip end off
+# the drawn curve. Instead the full spline is sampled once (against a nominal
+# plot area with the same axis ranges) into a dense table; any age is then a
+# slice of it, drawn as a plain polyline.
+X_RANGE = (0, 92)
+Y_RANGE = (0.9, 3.1)
+NOMINAL_PLOT_PX = (1000, 364)
+SPLINE_SMOOTHING = 0.7
+LUT_STEP = 0.1  # years
+DRAW_STRIDE = 5  # LUT samples per drawn point (0.5 years)
+AGE_MAX = X_RANGE[1]
+
+
+def spline_segments(pts, smoothing: float):
+    # Port of plotly.js Drawing.smoothopen/makeTangent (centripetal, exp 0.5).
+    if len(pts) < 3:
+        return [list(pts)]
+
+    tangents = []
+    for (px, py), (x, y), (nx, ny) in zip(pts, pts[1:], pts[2:]):
+        d1x, d1y = px - x, py - y
+        d2x, d2y = nx - x, ny - y
+        d1a = (d1x * d1x + d1y * d1y) ** 0.25
+        d2a = (d2x * d2x + d2y * d2y) ** 0.25
+        numx = (d2a * d2a * d1x - d1a * d1a * d2x) * smoothing
+        numy = (d2a * d2a * d1y - d1a * d1a * d2y) * smoothing
+        denom1 = 3 * d2a * (d1a + d2a)
+        denom2 = 3 * d1a * (d1a + d2a)
+        tangents.append(
+            (
+                (x + (numx / denom1 if denom1 else 0), y + (numy / denom1 if denom1 else 0)),
+                (x - (numx / denom2 if denom2 else 0), y - (numy / denom2 if denom2 else 0)),
+            )
+        )
+
+    segments = [[pts[0], tangents[0][0], pts[1]]]
+    for i in range(2, len(pts) - 1):
+        segments.append([pts[i - 1], tangents[i - 2][1], tangents[i - 1][0], pts[i]])
+    segments.append([pts[-2], tangents[-1][1], pts[-1]])
+    return segments
+
+
+def bezier_point(ctrl, t: float):
+    # De Casteljau; works for the quadratic and cubic segments alike.
+    while len(ctrl) > 1:
+        ctrl = [(a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t) for a, b in zip(ctrl, ctrl[1:])]
+    return ctrl[0]
+
+
+def curve_lut(points):
+    w, h = NOMINAL_PLOT_PX
+    (x0, x1), (y0, y1) = X_RANGE, Y_RANGE
+
+    def to_px(p):
+        return ((p[0] - x0) / (x1 - x0) * w, (y1 - p[1]) / (y1 - y0) * h)
+
+    def to_data(p):
+        return (x0 + p[0] / w * (x1 - x0), y1 - p[1] / h * (y1 - y0))
+
+    samples = [points[0]]
+    for seg in spline_segments([to_px(p) for p in points], SPLINE_SMOOTHING):
+        samples.extend(to_data(bezier_point(seg, i / 64)) for i in range(1, 65))
+
+    # Resample onto a uniform age grid (the path is monotone in x).
+    n = round((x1 - x0) / LUT_STEP)
+    xs = [round(x0 + i * LUT_STEP, 1) for i in range(n + 1)]
+    ys = []
+    j = 0
+    for x in xs:
+        while j < len(samples) - 2 and samples[j + 1][0] < x:
+            j += 1
+        (sx0, sy0), (sx1, sy1) = samples[j], samples[j + 1]
+        t = (x - sx0) / (sx1 - sx0) if sx1 != sx0 else 0.0
+        ys.append(round(sy0 + clamp(t, 0.0, 1.0) * (sy1 - sy0), 4))
+    return xs, ys
+
+
+def curve_until(lut, x_end: float):
+    xs, ys = lut
+    k = round(clamp(x_end, X_RANGE[0], AGE_MAX) / LUT_STEP)
+    picks = list(range(0, k + 1, DRAW_STRIDE))
+    if picks[-1] != k:
+        picks.append(k)
+    return [xs[i] for i in picks], [ys[i] for i in picks]
+
+
+# -------------------------
+# Figure spec
+# -------------------------
+# Figures are plain plotly.js spec dicts built from a shared layout template;
+# going through plotly.graph_objects would re-validate every property on
+# every build. The layout is shared by all figures and must not be mutated.
+HEALTH_TICKS = [0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 77, 80, 85, 90, 92]
+FADED = "rgba(0,0,0,0.55)"
+AXIS_LINE = "rgba(0,0,0,0.24)"
+
+HEALTH_LAYOUT = {
+    "height": 420,
+    "margin": {"l": 10, "r": 10, "t": 10, "b": 46},
+    "plot_bgcolor": "white",
+    "paper_bgcolor": "white",
+    "showlegend": False,
+    "font": {"color": FADED},
+    "xaxis": {
+        "range": list(X_RANGE),
+        "tickmode": "array",
+        "tickvals": HEALTH_TICKS,
+        "ticktext": [str(v) for v in HEALTH_TICKS],  # SAFE: no HTML here
+        "title": {"text": "Age", "font": {"size": 14, "color": FADED}, "standoff": 15},
+        "automargin": True,
+        "showgrid": False,
+        "zeroline": False,
+        "showline": True,
+        "linewidth": 1,
+        "linecolor": AXIS_LINE,
+        "ticks": "outside",
+        "tickfont": {"size": 12, "color": FADED},
+    },
+    "yaxis": {
+        "range": list(Y_RANGE),
+        "tickmode": "array",
+        "tickvals": [3, 2, 1],
+        "ticktext": ["Fit", "Functional", "Frail"],
+        "automargin": True,
+        "showgrid": True,
+        "gridcolor": "rgba(0,0,0,0.06)",
+        "zeroline": False,
+        "showline": True,
+        "linewidth": 1,
+        "linecolor": AXIS_LINE,
+        "ticks": "",
+        "tickfont": {"size": 13, "color": FADED},
+    },
+    # Emphasize 77 and 92 safely using annotations (HTML here is okay)
+    "annotations": [
+        {"x": 77, "y": 0.92, "text": "<b>77</b>", "showarrow": False, "yshift": -18},
+        {"x": 92, "y": 0.92, "text": "<b>92</b>", "showarrow": False, "yshift": -18},
+    ],
+}
+
+HEALTH_TRACE = {
+    "type": "scatter",
+    "mode": "lines",
+    "line": {"color": "#d11a1a", "width": 6},  # already spline-sampled
+    "hoverinfo": "skip",
+    "name": "Health",
+}
+
+
+def health_trace(xs, ys) -> dict:
+    return {**HEALTH_TRACE, "x": xs, "y": ys}
+
+
+COHORT_FILL = "rgba(209,26,26,0.12)"
+
+
+def cohort_traces(cohort_band: dict) -> list:
+    # 10th percentile edge, then the 90th filled down to it
+    edge = {"type": "scatter", "mode": "lines", "x": cohort_band["x"], "line": {"width": 0}, "hoverinfo": "skip"}
+    return [
+        {**edge, "y": cohort_band["lo"], "name": "Cohort p10"},
+        {**edge, "y": cohort_band["hi"], "name": "Cohort p90", "fill": "tonexty", "fillcolor": COHORT_FILL},
+    ]
+
+
+def spec_json(fig: dict) -> str:
+    return json.dumps(fig, separators=(",", ":"))
+
+
+@perf.timed("build_health_fig")
+def build_health_fig(lut, x_end: float, cohort_band=None) -> dict:
+    # Red segment (0 -> x_end), ending exactly on the drawn curve, over the
+    # cohort's percentile band when one is given.
+    xs, ys = curve_until(lut, x_end)
+    data = cohort_traces(cohort_band) if cohort_band is not None else []
+    data.append(health_trace(xs, ys))
+    return {"data": data, "layout": HEALTH_LAYOUT}
+
+
+# -------------------------
+# Personal overlay
+# -------------------------
+# A user's own (already downsampled) time series on a secondary y axis; its
+# units are whatever the export measured, so it gets an axis of its own.
+OVERLAY_TRACE = {
+    "type": "scatter",
+    "mode": "lines",
+    "line": {"color": "rgba(31,119,180,0.75)", "width": 1.5},
+    "yaxis": "y2",
+    "hovertemplate": "Age %{x:.1f}<br>%{y}<extra></extra>",
+}
+
+
+def overlay_axis(title: str) -> dict:
+    return {
+        "overlaying": "y",
+        "side": "right",
+        "title": {"text": escape(title), "font": {"size": 13, "color": FADED}},  # user text: escaped
+        "showgrid": False,
+        "zeroline": False,
+        "tickfont": {"size": 12, "color": FADED},
+        "automargin": True,
+    }
+
+
+def with_overlay(fig: dict, series: dict, title: str) -> dict:
+    trace = {**OVERLAY_TRACE, "x": series["x"], "y": series["y"], "name": title}
+    return {"data": fig["data"] + [trace], "layout": {**fig["layout"], "yaxis2": overlay_axis(title)}}
+
+
+def overlay_payload(payload: dict, series: dict, title: str) -> dict:
+    fig = with_overlay(payload["fig"], series, title)
+    return {"fig": fig, "json": spec_json(fig)}
+
+
+# -------------------------
+# Animation frames
+# -------------------------
+# One figure holding every band's segment as a named frame ("0", "1", ...).
+# All frames have the same number of points (samples past x_end collapse onto
+# the end point), so Plotly.animate can tween the line between bands.
+FRAME_TRANSITION = {
+    "frame": {"duration": 450, "redraw": False},
+    "transition": {"duration": 450, "easing": "cubic-in-out"},
+    "mode": "immediate",
+}
+
+
+def padded_segment(lut, x_end: float, length: int):
+    xs, ys = curve_until(lut, x_end)
+    pad = length - len(xs)
+    return xs + [xs[-1]] * pad, ys + [ys[-1]] * pad
+
+
+def build_frames_fig(lut, x_ends, active: int = 0) -> dict:
+    length = len(curve_until(lut, AGE_MAX)[0])
+    segments = [padded_segment(lut, x_end, length) for x_end in x_ends]
+    return {
+        "data": [health_trace(*segments[active])],
+        "layout": HEALTH_LAYOUT,
+        "frames": [{"name": str(i), "data": [{"x": xs, "y": ys}]} for i, (xs, ys) in enumerate(segments)],
+    }
+
+
+def build_health_payload(lut, x_end: float, cohort_band=None) -> dict:
+    fig = build_health_fig(lut, x_end, cohort_band)
+    return {"fig": fig, "json": spec_json(fig)}
+
+
+def build_frames_payload(lut, x_ends) -> dict:
+    fig = build_frames_fig(lut, x_ends)
+    return {"fig": fig, "json": spec_json(fig)}
+
+
+# -------------------------
+# Inline SVG chart
+# -------------------------
+# The same chart as build_health_fig, drawn server-side as a few KB of SVG
+# for the low-bandwidth mode (?chart=svg): no plotly.js bundle and no figure
+# JSON. Geometry comes from the LUT, so the red segment matches the plotly
+# one exactly; colors and ticks come from HEALTH_LAYOUT and HEALTH_TRACE.
+SVG_SIZE = (1000, HEALTH_LAYOUT["height"])
+SVG_PLOT = (72, 12, 990, 354)  # plot area: left, top, right, bottom
+SVG_FONT = "'Source Sans Pro', 'Source Sans 3', sans-serif"
+
+
+def svg_xy(x: float, y: float):
+    left, top, right, bottom = SVG_PLOT
+    (x0, x1), (y0, y1) = X_RANGE, Y_RANGE
+    return left + (x - x0) / (x1 - x0) * (right - left), top + (y1 - y) / (y1 - y0) * (bottom - top)
+
+
+def svg_points(xs, ys) -> str:
+    return " ".join("{:.1f},{:.1f}".format(*svg_xy(x, y)) for x, y in zip(xs, ys))
+
+
+def svg_text(x: float, y: float, text: str, size: int, anchor: str = "middle", bold: bool = False) -> str:
+    weight = ' font-weight="700"' if bold else ""
+    return f'<text x="{x:.1f}" y="{y:.1f}" font-size="{size}" text-anchor="{anchor}"{weight}>{escape(text)}</text>'
+
+
+@lru_cache(maxsize=1)
+def svg_axes() -> str:
+    # Everything but the data; identical for every band.
+    xa, ya = HEALTH_LAYOUT["xaxis"], HEALTH_LAYOUT["yaxis"]
+    left, top, right, bottom = SVG_PLOT
+    bold = {note["x"] for note in HEALTH_LAYOUT["annotations"]}
+    parts = []
+    for v, label in zip(ya["tickvals"], ya["ticktext"]):
+        y = svg_xy(X_RANGE[0], v)[1]
+        parts.append(f'<line x1="{left}" y1="{y:.1f}" x2="{right}" y2="{y:.1f}" stroke="{ya["gridcolor"]}"/>')
+        parts.append(svg_text(left - 8, y + 4.5, label, ya["tickfont"]["size"], "end"))
+    parts.append(
+        f'<path d="M{left} {top}V{bottom}H{right}" fill="none" stroke="{xa["linecolor"]}" stroke-width="{xa["linewidth"]}"/>'
+    )
+    ticks = []
+    for v, label in zip(xa["tickvals"], xa["ticktext"]):
+        x = svg_xy(v, Y_RANGE[0])[0]
+        ticks.append(f"M{x:.1f} {bottom}v5")
+        parts.append(svg_text(x, bottom + 19, label, xa["tickfont"]["size"], bold=v in bold))
+    parts.append(f'<path d="{"".join(ticks)}" stroke="{xa["linecolor"]}"/>')
+    title = xa["title"]
+    parts.append(svg_text((left + right) / 2, SVG_SIZE[1] - 14, title["text"], title["font"]["size"]))
+    return "".join(parts)
+
+
+def build_health_svg(lut, x_end: float, cohort_band=None) -> str:
+    # One line of markup (markdown would treat blank lines and indentation
+    # inside it as text).
+    w, h = SVG_SIZE
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {w} {h}" role="img" aria-label="Health by age"'
+        f' style="display:block;width:100%;height:auto" font-family="{SVG_FONT}" fill="{FADED}">',
+        svg_axes(),
+    ]
+    if cohort_band is not None:
+        xs = cohort_band["x"]
+        outline = svg_points(xs + xs[::-1], cohort_band["hi"] + cohort_band["lo"][::-1])
+        parts.append(f'<polygon points="{outline}" fill="{COHORT_FILL}"/>')
+    line = HEALTH_TRACE["line"]
+    parts.append(
+        f'<polyline points="{svg_points(*curve_until(lut, x_end))}" fill="none" stroke="{line["color"]}"'
+        f' stroke-width="{line["width"]}" stroke-linecap="round" stroke-linejoin="round"/>'
+    )
+    parts.append("</svg>")
+    return "".join(parts)
+
+# -------------------------
+# Sparkline sprite
+# -------------------------
+# One SVG holding a tiny thumbnail per band: the whole curve faded, and the
+# stretch up to the band's end in its engine color. Symbols are "spark-0",
+# "spark-1", ...; the navigation strip only references them, so the sheet is
+# built once per deck and downloaded once per browser.
+SPARK_VIEWBOX = (92, 40)
+SPARK_STEP = 1.0  # years between sparkline points
+
+
+def spark_points(lut, x_end: float) -> str:
+    xs, ys = lut
+    w, h = SPARK_VIEWBOX
+    (x0, x1), (y0, y1) = X_RANGE, Y_RANGE
+    k = round(clamp(x_end, x0, x1) / LUT_STEP)
+    picks = list(range(0, k + 1, round(SPARK_STEP / LUT_STEP)))
+    if picks[-1] != k:
+        picks.append(k)
+    return " ".join(
+        f"{(xs[i] - x0) / (x1 - x0) * w:.1f},{2 + (y1 - ys[i]) / (y1 - y0) * (h - 4):.1f}" for i in picks
+    )
+
+
+def sparkline_sprite(lut, ends) -> str:
+    # ends: (x_end, color) per band
+    w, h = SPARK_VIEWBOX
+    line = 'fill="none" stroke-linecap="round" stroke-linejoin="round" vector-effect="non-scaling-stroke"'
+    symbols = [
+        f'<symbol id="spark-bg" viewBox="0 0 {w} {h}">'
+        f'<polyline points="{spark_points(lut, AGE_MAX)}" stroke="rgba(0,0,0,0.16)" stroke-width="1.5" {line}/>'
+        "</symbol>"
+    ]
+    for i, (x_end, color) in enumerate(ends):
+        points = spark_points(lut, x_end)
+        cx, cy = points.rsplit(" ", 1)[-1].split(",")
+        symbols.append(
+            f'<symbol id="spark-{i}" viewBox="0 0 {w} {h}"><use href="#spark-bg"/>'
+            f'<polyline points="{points}" stroke="{escape(color)}" stroke-width="2.5" {line}/>'
+            f'<circle cx="{cx}" cy="{cy}" r="2.5" fill="{escape(color)}"/></symbol>'
+        )
+    return '<svg xmlns="http://www.w3.org/2000/svg">\n' + "\n".join(symbols) + "\n</svg>\n"
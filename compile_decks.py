@@ -0,0 +1,28 @@
+import argparse
+
+from decks import DECKS, docx_path
+from decks.ingest import cache_path, compiled_bands, file_digest
+
+# Compiles each deck's source document into the band cache (decks/ingest.py),
+# so app workers start from the cache and never parse a .docx themselves:
+#
+#   python compile_decks.py                  # every deck with a source document
+#   python compile_decks.py --deck sal-health
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile deck source documents into the band cache.")
+    parser.add_argument("--deck", action="append", choices=sorted(DECKS), help="deck to compile (default: all)")
+    args = parser.parse_args()
+
+    for deck_id in args.deck or list(DECKS):
+        path = docx_path(deck_id)
+        if path is None or not path.exists():
+            print(f"{deck_id}: no source document, using its module's BANDS")
+            continue
+        bands = compiled_bands(path)
+        print(f"{deck_id}: {len(bands)} bands -> {cache_path(file_digest(path))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import importlib
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+import charts
+import cohort
+import render
+from decks import ingest
+from decks.model import DeckHeader, build_bands, build_header
+from decks.search import SearchIndex
+
+# -------------------------
+# Registry
+# -------------------------
+# Deck id -> where its content lives. A deck module must define HEADER, BANDS
+# and health_curve_points(); it is only imported the first time the deck is
+# used. A deck with a "docx" source (relative to the repo root) takes its
+# bands from that document when it exists (see decks/ingest.py) and is
+# reloaded when the file changes; the module's BANDS are the fallback.
+DECKS = {
+    "sal-health": {
+        "module": "decks.sal_health",
+        "page_title": "LRP • Health (SAL)",
+        "docx": "content/Life Reclamation Project Health text for SAL and LRP Slides.docx",
+    },
+}
+DEFAULT_DECK = "sal-health"
+
+# Loaded decks are kept in a process-wide LRU bounded by their (approximate)
+# serialized size, so hosting many decks doesn't pin all of them in memory.
+DECK_CACHE_BYTES = int(os.environ.get("LRP_DECK_CACHE_MB", "64")) * 1024 * 1024
+AGE_FIGURES_PER_DECK = 256
+COHORTS_PER_DECK = 8
+RELOAD_CHECK_S = 1.0  # how often a deck's source document is stat()ed
+
+log = logging.getLogger(__name__)
+
+
+# -------------------------
+# Age -> band index
+# -------------------------
+# Each band covers (a0, a1] (the first one also includes its a0). Boundaries are
+# sorted once and checked for gaps/overlaps, so lookups are a bisect. Ages
+# outside the deck clamp to the first/last band.
+class BandIndex:
+    def __init__(self, bands):
+        self.order = sorted(range(len(bands)), key=lambda i: bands[i].a0)
+        self.ends = []
+        for i in self.order:
+            a0, a1 = bands[i].a0, bands[i].a1
+            if a0 >= a1:
+                raise ValueError(f"Band {i} has an empty age range {a0}–{a1}")
+            if self.ends and a0 < self.ends[-1]:
+                raise ValueError(f"Band {i} ({a0}–{a1}) overlaps the band ending at {self.ends[-1]}")
+            if self.ends and a0 > self.ends[-1]:
+                raise ValueError(f"Gap in ages {self.ends[-1]}–{a0} before band {i}")
+            self.ends.append(a1)
+
+    def band_for_age(self, age: float) -> int:
+        return self.order[min(bisect_left(self.ends, age), len(self.ends) - 1)]
+
+
+# -------------------------
+# Deck
+# -------------------------
+class Deck:
+    def __init__(self, deck_id: str, header: DeckHeader, bands, curve, previous=None):
+        # previous: the deck this one reloads; whatever didn't change (a
+        # band's compiled cards, figures for the same ages, the curve's
+        # caches) is carried over instead of rebuilt.
+        same_curve = previous is not None and previous.curve == curve
+        self.id = deck_id
+        self.page_title = DECKS[deck_id]["page_title"]
+        self.version = previous.version + 1 if previous is not None else 0
+        self.header = header
+        self.bands = bands
+        self.curve = curve
+        self.index = BandIndex(bands)
+        self.lut = previous.lut if same_curve else charts.curve_lut(curve)
+        if previous is not None and previous.header == header:
+            self.dictionary_html = previous.dictionary_html
+        else:
+            self.dictionary_html = render.validate_html(render.dictionary_card_html(header))
+        compiled = dict(zip(previous.bands, previous.html)) if previous is not None else {}
+        self.html = [compiled.get(band) or render.compile_band_html(band) for band in bands]
+        self.search = SearchIndex(bands)
+        # Navigation thumbnails: one hashed sprite sheet per deck content
+        self.sparks_svg = charts.sparkline_sprite(self.lut, [(b.a1, render.ENGINE_COLORS[b.engine.value]) for b in bands])
+        self.sparks_file = render.hashed_name("sparks.{}.svg", self.sparks_svg)
+        self.strip_labels = [f"Ages {b.a0}–{b.a1}" for b in bands]
+
+        # Every band's figure is prebuilt; scrubbed ages are cached on demand.
+        self.figures = {}
+        for band in bands:
+            if band.a1 not in self.figures:
+                if same_curve and band.a1 in previous.figures:
+                    self.figures[band.a1] = previous.figures[band.a1]
+                else:
+                    self.figures[band.a1] = charts.build_health_payload(self.lut, band.a1)
+        self._age_figures = previous._age_figures.copy() if same_curve else OrderedDict()
+        self._cohorts = previous._cohorts.copy() if same_curve else OrderedDict()
+        self._svgs = OrderedDict()
+        self._frames = None
+        if same_curve and [b.a1 for b in bands] == [b.a1 for b in previous.bands]:
+            self._frames = previous._frames
+        self._lock = threading.Lock()
+
+        # Source document watch state, set by load_deck
+        self.source = None
+        self.source_mtime = None
+        self.checked_at = 0.0
+
+    def band_for_age(self, age: float) -> int:
+        return self.index.band_for_age(age)
+
+    def figure(self, x_end: float, cohort_params=None) -> dict:
+        # cohort_params (a cohort.CohortParams) adds that cohort's percentile band.
+        if cohort_params is None:
+            payload = self.figures.get(x_end)
+            if payload is not None:
+                return payload
+
+        key = (round(x_end / charts.LUT_STEP), cohort_params)
+        with self._lock:
+            payload = self._age_figures.get(key)
+            if payload is not None:
+                self._age_figures.move_to_end(key)
+                return payload
+
+        band = self.cohort_band(cohort_params) if cohort_params is not None else None
+        payload = charts.build_health_payload(self.lut, key[0] * charts.LUT_STEP, band)
+        with self._lock:
+            self._age_figures[key] = payload
+            while len(self._age_figures) > AGE_FIGURES_PER_DECK:
+                self._age_figures.popitem(last=False)
+        return payload
+
+    def svg_chart(self, x_end: float, cohort_params=None) -> str:
+        # Inline SVG version of figure(), memoized the same way.
+        key = (round(x_end / charts.LUT_STEP), cohort_params)
+        with self._lock:
+            markup = self._svgs.get(key)
+            if markup is not None:
+                self._svgs.move_to_end(key)
+                return markup
+
+        band = self.cohort_band(cohort_params) if cohort_params is not None else None
+        markup = charts.build_health_svg(self.lut, key[0] * charts.LUT_STEP, band)
+        with self._lock:
+            self._svgs[key] = markup
+            while len(self._svgs) > AGE_FIGURES_PER_DECK:
+                self._svgs.popitem(last=False)
+        return markup
+
+    def cohort_band(self, params) -> dict:
+        # Simulated once per parameter set; flipping bands only reuses it.
+        with self._lock:
+            band = self._cohorts.get(params)
+            if band is not None:
+                self._cohorts.move_to_end(params)
+                return band
+
+        band = cohort.simulate(self.lut, params)
+        with self._lock:
+            self._cohorts[params] = band
+            while len(self._cohorts) > COHORTS_PER_DECK:
+                self._cohorts.popitem(last=False)
+        return band
+
+    def frames_figure(self) -> dict:
+        # Single figure with one animation frame per band, built on first use.
+        if self._frames is None:
+            payload = charts.build_frames_payload(self.lut, [band.a1 for band in self.bands])
+            with self._lock:
+                self._frames = payload
+        return self._frames
+
+    def nbytes(self) -> int:
+        # Serialized figures dominate; compiled card markup is counted too.
+        with self._lock:
+            payloads = list(self.figures.values()) + list(self._age_figures.values())
+            if self._frames is not None:
+                payloads.append(self._frames)
+            svgs = sum(len(markup) for markup in self._svgs.values())
+        text = len(self.dictionary_html) + len(self.sparks_svg) + sum(len(markup) for cards in self.html for markup in cards.values())
+        return text + svgs + sum(len(p["json"]) for p in payloads)
+
+
+def docx_path(deck_id: str):
+    source = DECKS[deck_id].get("docx")
+    return ingest.ROOT / source if source else None
+
+
+def source_mtime(path):
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def deck_content(deck_id: str, use_source: bool = True):
+    # Validated (header, bands, curve points) without any derived artifacts.
+    module = importlib.import_module(DECKS[deck_id]["module"])
+    bands = module.BANDS
+    path = docx_path(deck_id)
+    if use_source and path is not None and path.exists():
+        bands = ingest.compiled_bands(path)
+    return build_header(module.HEADER), build_bands(bands), module.health_curve_points()
+
+
+def load_deck(deck_id: str, previous: Deck = None) -> Deck:
+    path = docx_path(deck_id)
+    mtime = source_mtime(path) if path is not None else None  # before reading, so no edit is missed
+    try:
+        deck = Deck(deck_id, *deck_content(deck_id), previous=previous)
+    except ingest.ERRORS as e:
+        # A malformed source document on first load: start from the module's
+        # BANDS (a hot reload keeps the last good deck instead, see below).
+        if previous is not None or mtime is None:
+            raise
+        log.warning("Deck %r uses its built-in bands; loading %s failed: %s", deck_id, path.name, e)
+        deck = Deck(deck_id, *deck_content(deck_id, use_source=False))
+    deck.source, deck.source_mtime, deck.checked_at = path, mtime, time.monotonic()
+    return deck
+
+
+# -------------------------
+# Deck cache (process-wide)
+# -------------------------
+class DeckCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._decks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, deck_id: str) -> Deck:
+        with self._lock:
+            deck = self._decks.get(deck_id)
+            if deck is not None:
+                self._decks.move_to_end(deck_id)
+                return self._reload_if_changed(deck)
+
+            deck = load_deck(deck_id)
+            self._decks[deck_id] = deck
+            self._evict()
+            return deck
+
+    def _reload_if_changed(self, deck: Deck) -> Deck:
+        # Hot reload: an edited source document replaces the deck, reusing
+        # the derived artifacts of every band that didn't change. Sessions
+        # holding the old deck keep working until their next rerun.
+        now = time.monotonic()
+        if deck.source is None or now - deck.checked_at < RELOAD_CHECK_S:
+            return deck
+        deck.checked_at = now
+        mtime = source_mtime(deck.source)
+        if mtime == deck.source_mtime:
+            return deck
+        try:
+            fresh = load_deck(deck.id, previous=deck)
+        except ingest.ERRORS as e:
+            # A half-saved or malformed document: keep serving the last good
+            # deck and wait for the next edit.
+            log.warning("Keeping deck %r; reloading %s failed: %s", deck.id, deck.source.name, e)
+            deck.source_mtime = mtime
+            return deck
+        self._decks[deck.id] = fresh
+        self._evict()
+        return fresh
+
+    def _evict(self):
+        # Least recently used first; the deck just requested always stays.
+        sizes = {deck_id: deck.nbytes() for deck_id, deck in self._decks.items()}
+        total = sum(sizes.values())
+        while total > self.max_bytes and len(self._decks) > 1:
+            deck_id, _ = self._decks.popitem(last=False)
+            total -= sizes[deck_id]
+
+
+_cache = DeckCache(DECK_CACHE_BYTES)
+
+
+def get_deck(deck_id: str = DEFAULT_DECK) -> Deck:
+    if deck_id not in DECKS:
+        raise KeyError(f"Unknown deck {deck_id!r}")
+    return _cache.get(deck_id)
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import re
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+# -------------------------
+# .docx ingestion
+# -------------------------
+# Compiles a deck's source document into the same raw band dicts a deck
+# module's BANDS holds. document.xml is streamed out of the zip with
+# iterparse and each paragraph is dropped once read, so memory stays flat
+# however long the document is. The layout it expects:
+#
+#   Heading paragraph   "Ages 0–5: Heading text"   starts a band
+#   List paragraphs     bullets
+#   "Diagnosis: …"      diagnosis (following plain paragraphs continue it)
+#   "Prescription: …"   prescription (likewise)
+#   "Engine: red"       engine color
+#
+# Anything before the first age heading (title page, notes) is ignored.
+# Results are cached as JSON under the document's content hash, so a
+# document is parsed once per edit; compile_decks.py compiles ahead of time
+# so app workers only ever read the cache.
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.environ.get("LRP_INGEST_CACHE", ROOT / ".deck_cache"))
+CACHE_FORMAT = 1  # bump when the parser's output changes
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+P, T, TAB, BR, CR = W + "p", W + "t", W + "tab", W + "br", W + "cr"
+PSTYLE, NUMPR, VAL = W + "pStyle", W + "numPr", W + "val"
+
+AGE_HEADING = re.compile(r"^(?:ages?\s+)?(\d+(?:\.\d+)?)\s*[–—-]\s*(\d+(?:\.\d+)?)\s*[:.·–—-]?\s*(.*)$", re.I)
+LABEL = re.compile(r"^(diagnosis|prescription|rx|(?:check\s+)?engine)\s*:\s*(.*)$", re.I)
+LABEL_FIELDS = {"diagnosis": "diagnosis", "prescription": "prescription", "rx": "prescription", "engine": "engine"}
+
+# What a missing, half-saved or malformed document can raise (KeyError: no
+# document.xml, or a band missing a field)
+ERRORS = (OSError, KeyError, ValueError, zipfile.BadZipFile, ET.ParseError)
+
+
+def paragraphs(path):
+    # (style id, is list item, text) per paragraph of the document body
+    with zipfile.ZipFile(path) as zf, zf.open("word/document.xml") as xml:
+        style, listed, text = "", False, []
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == P:
+                    style, listed, text = "", False, []
+            elif tag == T:
+                text.append(elem.text or "")
+            elif tag in (TAB, BR, CR):
+                text.append(" ")
+            elif tag == PSTYLE:
+                style = elem.get(VAL, "")
+            elif tag == NUMPR:
+                listed = True
+            elif tag == P:
+                yield style, listed, " ".join("".join(text).split())
+                elem.clear()
+
+
+def number(text: str):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def parse_bands(paras) -> list:
+    bands, band, field = [], None, None
+    for style, listed, text in paras:
+        if not text:
+            continue
+        style = style.lower()
+        heading = AGE_HEADING.match(text) if style.startswith(("heading", "title")) else None
+        if heading:
+            a0, a1, title = heading.groups()
+            band = {
+                "a0": number(a0),
+                "a1": number(a1),
+                "heading": title,
+                "bullets": [],
+                "diagnosis": "",
+                "prescription": "",
+                "engine": "",
+            }
+            bands.append(band)
+            field = None
+            continue
+        if band is None:
+            continue
+
+        label = LABEL.match(text)
+        if label:
+            field = LABEL_FIELDS[label.group(1).lower().split()[-1]]
+            band[field] = label.group(2).lower() if field == "engine" else label.group(2)
+        elif listed or style.startswith("list") or field is None:
+            band["bullets"].append(text)
+            field = None
+        else:
+            band[field] = f"{band[field]} {text}".strip()
+
+    if not bands:
+        raise ValueError("No age-range headings (e.g. 'Ages 0–5: …') found in the document")
+    return bands
+
+
+def file_digest(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(digest: str) -> Path:
+    return CACHE_DIR / f"{digest[:24]}.v{CACHE_FORMAT}.json"
+
+
+def compiled_bands(path) -> list:
+    # Raw band dicts for the document, from the cache when this exact content
+    # has been compiled before.
+    cached = cache_path(file_digest(path))
+    try:
+        return json.loads(cached.read_text(encoding="utf-8"))["bands"]
+    except FileNotFoundError:
+        pass
+
+    bands = parse_bands(paragraphs(path))
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"source": Path(path).name, "bands": bands}, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, cached)  # concurrent compiles of the same content are harmless
+    return bands
+
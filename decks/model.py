@@ -0,0 +1,67 @@
+import sys
+from dataclasses import dataclass
+from enum import Enum
+
+# -------------------------
+# Band data model
+# -------------------------
+# Deck modules author content as plain dicts; at load time they become
+# immutable, slotted records. Fields shared by every band (the dictionary
+# card) live once on the deck header, and all strings are interned so decks
+# with repeated wording don't hold duplicate copies.
+
+
+class Engine(str, Enum):
+    GREEN = "green"
+    YELLOW = "yellow"
+    ORANGE = "orange"
+    RED = "red"
+
+
+@dataclass(frozen=True, slots=True)
+class DeckHeader:
+    slide_title: str
+    word: str
+    pos: str
+    phon: str
+    def1: str
+    def2: str
+
+
+@dataclass(frozen=True, slots=True)
+class Band:
+    a0: float
+    a1: float
+    heading: str
+    bullets: tuple
+    diagnosis: str
+    prescription: str
+    engine: Engine
+
+
+def build_header(raw: dict) -> DeckHeader:
+    return DeckHeader(**{name: sys.intern(str(value)) for name, value in raw.items()})
+
+
+def build_band(raw: dict, i: int = 0) -> Band:
+    a0, a1 = raw["a0"], raw["a1"]
+    if not (0 <= a0 < a1):
+        raise ValueError(f"Band {i} has an invalid age range {a0}–{a1}")
+    try:
+        engine = Engine(raw["engine"])
+    except ValueError:
+        raise ValueError(f"Band {i} has an unknown engine color {raw['engine']!r}") from None
+
+    return Band(
+        a0=a0,
+        a1=a1,
+        heading=sys.intern(raw["heading"]),
+        bullets=tuple(sys.intern(x) for x in raw["bullets"]),
+        diagnosis=sys.intern(raw["diagnosis"]),
+        prescription=sys.intern(raw["prescription"]),
+        engine=engine,
+    )
+
+
+def build_bands(raw_bands) -> tuple:
+    return tuple(build_band(raw, i) for i, raw in enumerate(raw_bands))
@@ -0,0 +1,257 @@
+# =========================
+# AUTHORITATIVE TEXT SOURCE
+# =========================
+# Populated from: "Life Reclamation Project Health text for SAL and LRP Slides.docx"
+# Dan confirmed these docs are authoritative.
+
+# Shared by every band of the deck (the dictionary card)
+HEADER = {
+    "slide_title": "HEALTH · STANDARD AMERICAN LIFE",
+    "word": "health",
+    "pos": "noun",
+    "phon": "/helTH/",
+    "def1": "the absence of disease or infirmity",
+    "def2": "also: the capacity to live, move, and engage fully with life",
+}
+
+BANDS = [
+    {
+        "a0": 0,
+        "a1": 5,
+        "heading": "Health is assumed and unexamined.",
+        "bullets": [
+            "Lots of unstructured play, exploration, and bonding with parents",
+            "Sleep is mostly protected; routines feel supportive and calming",
+            "Daycare schedules, frequent illness, and hand-offs begin to disrupt rhythm",
+            "Screens are introduced occasionally to soothe, distract, or buy quiet",
+        ],
+        "diagnosis": "Everything looks normal and on track for age.",
+        "prescription": "Stay on schedule with the ~25 to 35 vaccinations. Use antibiotics and fever reducers when needed. Kids are resilient — there’s nothing to worry about.",
+        "engine": "green",
+    },
+    {
+        "a0": 5,
+        "a1": 10,
+        "heading": "Activity is natural and effortless.",
+        "bullets": [
+            "Real play with friends is still common; movement happens naturally and joyfully",
+            "A first sport or activity is introduced — with fruit snacks and juice boxes as the reward",
+            "Screens and online entertainment increasingly fill “in-between” time",
+            "Busy schedules lead to quicker meals and less intentional nutrition",
+        ],
+        "diagnosis": "Healthy growth and development within expected ranges.",
+        "prescription": "Keep doing what you’re doing. Encourage activity, limit treats when you can, and address issues as they come up.",
+        "engine": "green",
+    },
+    {
+        "a0": 10,
+        "a1": 15,
+        "heading": "Structure increases, resilience masks cost.",
+        "bullets": [
+            "Organized sports and activities increase, but free play declines",
+            "Screens, games, and phones begin to dominate downtime and social life",
+            "Sleep duration and quality erodes due to early schedules and late-night stimulation",
+            "Food choices tilt increasingly toward convenience and peer-influenced habits",
+        ],
+        "diagnosis": "Typical adolescent changes; fatigue, mood swings, and irregular sleep are common.",
+        "prescription": "Try to get enough sleep, eat reasonably well, and stay active when schedules allow. This phase usually passes.",
+        "engine": "green",
+    },
+    {
+        "a0": 15,
+        "a1": 20,
+        "heading": "Activity stays high as recovery slips.",
+        "bullets": [
+            "Fitness takes a back seat, with perhaps one school sport remaining as the last truly demanding activity",
+            "Sleep erodes further due to school demands, increased screen time, and social schedules",
+            "Caffeine, sugar, and ultra-processed foods are used to manage energy and stress",
+            "Strength training, cardio, and recovery, that were never foundational, slip even further away",
+        ],
+        "diagnosis": "Occasional bouts of anxiety, low mood, and emotional volatility are considered normal at this age. Plus weight gain.",
+        "prescription": "Try reducing screen time, get some fresh air, and manage stress. Revisit if problems persist or worsen.",
+        "engine": "yellow",
+    },
+    {
+        "a0": 20,
+        "a1": 25,
+        "heading": "Movement is quietly replaced.",
+        "bullets": [
+            "Physical activity declines sharply as college and early career demands dominate daily life",
+            "Long hours seated at a laptop replace movement, with posture and mobility beginning to suffer",
+            "Sleep irregularities worsen due to deadlines, online social demands, and screen exposure",
+            "Convenience foods, caffeine, and snacks are used to sustain focus and productivity while alcohol is used to unwind and decompress",
+        ],
+        "diagnosis": "Young and generally healthy despite irregular routines.",
+        "prescription": "Focus on stress management. Eat right when you can, stay active when possible, and don’t worry too much — you’re young!",
+        "engine": "yellow",
+    },
+    {
+        "a0": 25,
+        "a1": 30,
+        "heading": "Health competes with productivity.",
+        "bullets": [
+            "Fitness becomes sporadic, squeezed in only when time and energy allow",
+            "Long hours sitting at work carry over into evenings and weekends",
+            "Along with weight gain, minor aches and stiffness appear, but are dismissed as temporary or stress-related",
+            "Sleep and nutrition are traded for productivity, convenience, social life, and more routine alcohol use",
+        ],
+        "diagnosis": "Lifestyle strain and weight gain is noted, but nothing is outside normal expectations.",
+        "prescription": "Try to eat better, exercise more, and get more sleep. Small changes add up.",
+        "engine": "yellow",
+    },
+    {
+        "a0": 30,
+        "a1": 35,
+        "heading": "“I’ll get back to it later.”",
+        "bullets": [
+            "Career and family demands make any attempt at consistent training feel nearly impossible",
+            "Sitting, stress, and mental load dominate most days",
+            "Weight gain, stiffness, and recurring pain accelerates",
+            "Health is managed reactively, with plans to “get back on track” later",
+        ],
+        "diagnosis": "Weight gain, fatigue, and aches are typical at this stage of life.",
+        "prescription": "Work on balance. Lose a little weight if you can, be more active when time allows.",
+        "engine": "yellow",
+    },
+    {
+        "a0": 35,
+        "a1": 40,
+        "heading": "Stress and decline feel ordinary.",
+        "bullets": [
+            "Work and family responsibilities and distractions consume most discretionary time",
+            "Chronic stress, decreased productivity and long hours accumulate",
+            "Lingering pain and fatigue is ever present",
+            "Health is discussed more than acted upon",
+        ],
+        "diagnosis": "Cumulative stress effects are apparent, though labs remain acceptable.",
+        "prescription": "Continue monitoring. Lifestyle changes may help if symptoms worsen.",
+        "engine": "yellow",
+    },
+    {
+        "a0": 40,
+        "a1": 45,
+        "heading": "Warning lights flicker.",
+        "bullets": [
+            "Energy and resilience decline is becoming pronounced",
+            "Blood pressure, cholesterol, and weight creep ever upward",
+            "Exercise remains aspirational, never habitual",
+            "Health is outsourced to annual checkups, and red flag deferrals",
+        ],
+        "diagnosis": "Risk factors are emerging, but consistent with “normal aging.”",
+        "prescription": "Watch the numbers. Eat right, exercise more, and we’ll recheck next year.",
+        "engine": "yellow",
+    },
+    {
+        "a0": 45,
+        "a1": 50,
+        "heading": "Prevention gives way to control.",
+        "bullets": [
+            "Health concerns feel more personal as peers face diagnoses",
+            "Medications or guidance are introduced",
+            "Physical activity is cautiously introduced but dropped",
+            "Capacity continues to decline",
+        ],
+        "diagnosis": "Blood pressure, cholesterol, or weight are trending upward.",
+        "prescription": "Try diet and exercise first. If trends continue, medication can help.",
+        "engine": "orange",
+    },
+    {
+        "a0": 50,
+        "a1": 55,
+        "heading": "Comfort replaces capability.",
+        "bullets": [
+            "Daily routines adjust to avoid discomfort",
+            "Strength, balance, and power have diminished greatly",
+            "Travel and hobbies are chosen with limits in mind",
+            "Health decisions prioritize symptom control",
+        ],
+        "diagnosis": "Age-related functional decline is within expected limits.",
+        "prescription": "Adjust activities to what you can do. Avoid overdoing it.",
+        "engine": "orange",
+    },
+    {
+        "a0": 55,
+        "a1": 60,
+        "heading": "Decline steepens.",
+        "bullets": [
+            "Strength and stamina drop faster than expected",
+            "Pain and chronic conditions shape daily choices",
+            "Exercise becomes “therapy,” not growth",
+            "Independence remains, but health is fading, shrinking",
+        ],
+        "diagnosis": "Early chronic conditions such as prediabetes or hypertension are identified.",
+        "prescription": "Begin standard medical therapy. Focus on compliance and monitoring.",
+        "engine": "red",
+    },
+    {
+        "a0": 60,
+        "a1": 65,
+        "heading": "Effort carries a cost.",
+        "bullets": [
+            "Independence persists, but effort requires planning",
+            "Strength and aerobic capacity have eroded",
+            "Medications are routine",
+            "Activities are chosen to minimize falls and fractures",
+        ],
+        "diagnosis": "We are doing what we can. Multiple risk factors have pharmaceutical answers.",
+        "prescription": "Prioritize safety and consistency.",
+        "engine": "red",
+    },
+    {
+        "a0": 65,
+        "a1": 70,
+        "heading": "Confidence fades.",
+        "bullets": [
+            "Physical confidence declines",
+            "Recovery becomes unreliable",
+            "Medications expand",
+            "Daily choices prioritize safety",
+        ],
+        "diagnosis": "Declined strength is attributed to normal aging.",
+        "prescription": "Simplify routines. Avoid injury.",
+        "engine": "red",
+    },
+    {
+        "a0": 70,
+        "a1": 75,
+        "heading": "Risk becomes central.",
+        "bullets": [
+            "Restricting daily activities, outings, or hobbies around limited energy levels",
+            "Independence relies on complex, daily medication management with side effects",
+            "Bone density is greatly reduced while minor scrapes or bruises take longer to heal",
+            "Recovery from illness or injury requires a longer-term rest or physical therapy",
+        ],
+        "diagnosis": "Falls and slower recovery are expected at this age.",
+        "prescription": "Use assistive devices. Modify living space.",
+        "engine": "red",
+    },
+    {
+        "a0": 75,
+        "a1": 77,
+        "heading": "Decline ends abruptly.",
+        "bullets": [
+            "Multiple health conditions (heart disease, diabetes, dementia) are likely to coexist and interact, complicating treatment and recovery",
+            "Rapid reduction in strength, walking speed, and overall energy levels makes daily activities extremely hard",
+            "The failing immune system turns minor illness into life threatening pneumonia or sepsis",
+            "A prolonged homebound or nursing-home physical decline ends in Death",
+        ],
+        "diagnosis": "Serious illness or injury is common.",
+        "prescription": "Hospitalization, rehab, or hospice. Focus on comfort.",
+        "engine": "red",
+    },
+]
+
+
+def health_curve_points():
+    # y-scale: Fit ~3, Functional ~2, Frail ~1
+    # Tuned so ~55 is near the functional/frail boundary.
+    return [
+        (0, 2.92),
+        (10, 2.92),
+        (25, 2.70),
+        (40, 2.35),
+        (55, 2.06),
+        (65, 1.85),
+        (77, 1.62),
+        (92, 1.22),
+    ]
@@ -0,0 +1,153 @@
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from html import escape
+
+# -------------------------
+# Band search index
+# -------------------------
+# Inverted index over each band's text, built once per deck at load time.
+# Terms are lowercased, lightly stemmed words; postings record a
+# field-weighted term frequency per band. The sorted term list gives prefix
+# matches by bisection, so a lookup never scans the bands.
+FIELDS = (("heading", 3.0), ("bullets", 1.5), ("diagnosis", 1.0), ("prescription", 1.0))
+PREFIX_WEIGHT = 0.5  # a prefix-only match counts half as much as the word itself
+SNIPPET_CHARS = 90
+MAX_HITS = 8
+
+WORD = re.compile(r"[a-z0-9]+(?:['’][a-z]+)?")
+SUFFIXES = ("ations", "ation", "ings", "ing", "edly", "ed", "ly")
+
+
+def stem(word: str) -> str:
+    # Light suffix stripping (plurals, -ing/-ed/-ly, trailing e) so that e.g.
+    # "changes", "changed" and "changing" all index as "chang".
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        word = word[:-3] + "y"
+    elif word.endswith(("sses", "ches", "shes", "xes", "zes")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            break
+    return word[:-1] if word.endswith("e") and len(word) > 3 else word
+
+
+def words(text: str):
+    # (stem, start, end) for every word in text
+    return [
+        (stem(m.group().replace("’", "'").split("'")[0]), m.start(), m.end())
+        for m in WORD.finditer(text.lower())
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    idx: int
+    score: float
+    field: str
+    snippet: str  # escaped HTML with <mark>ed matches
+
+
+class SearchIndex:
+    def __init__(self, bands):
+        self.texts = [
+            {
+                "heading": band.heading,
+                "bullets": " · ".join(band.bullets),
+                "diagnosis": band.diagnosis,
+                "prescription": band.prescription,
+            }
+            for band in bands
+        ]
+
+        # Word positions are kept for building snippets without re-tokenizing.
+        self.words = [{name: words(fields[name]) for name, _ in FIELDS} for fields in self.texts]
+
+        weighted = defaultdict(lambda: defaultdict(float))  # term -> band -> weight
+        for idx, band_words in enumerate(self.words):
+            for name, weight in FIELDS:
+                for term, _, _ in band_words[name]:
+                    weighted[term][idx] += weight
+
+        n = len(self.texts)
+        self.terms = sorted(weighted)
+        # term -> ((band, tf * idf), ...)
+        self.postings = {
+            term: tuple((idx, w * (1 + math.log(n / len(by_band)))) for idx, w in by_band.items())
+            for term, by_band in weighted.items()
+        }
+
+    def prefix_terms(self, prefix: str):
+        i = bisect_left(self.terms, prefix)
+        while i < len(self.terms) and self.terms[i].startswith(prefix):
+            yield self.terms[i]
+            i += 1
+
+    def term_scores(self, token: str, stemmed: str) -> dict:
+        # band -> score for one query word: its stem exactly, or (at
+        # PREFIX_WEIGHT) any indexed term it is a prefix of.
+        scores = {}
+        for term in set(self.prefix_terms(token)) | {stemmed}:
+            factor = 1.0 if term == stemmed else PREFIX_WEIGHT
+            for idx, score in self.postings.get(term, ()):
+                scores[idx] = max(scores.get(idx, 0.0), score * factor)
+        return scores
+
+    def search(self, query: str, limit: int = MAX_HITS) -> list:
+        # Bands matching every query word, best first.
+        query_words = [(m.group(), stem(m.group())) for m in WORD.finditer(query.lower())]
+        if not query_words:
+            return []
+
+        totals = None
+        for token, stemmed in query_words:
+            scores = self.term_scores(token, stemmed)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {idx: totals[idx] + s for idx, s in scores.items() if idx in totals}
+            if not totals:
+                return []
+
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [self.hit(idx, score, query_words) for idx, score in ranked]
+
+    def hit(self, idx: int, score: float, query_words) -> SearchHit:
+        # Snippet from the highest-weighted field that mentions a query word.
+        for name, _ in FIELDS:
+            text = self.texts[idx][name]
+            spans = [
+                (start, end)
+                for term, start, end in self.words[idx][name]
+                if any(term == stemmed or term.startswith(token) for token, stemmed in query_words)
+            ]
+            if spans:
+                return SearchHit(idx, score, name, snippet_html(text, spans))
+        return SearchHit(idx, score, "heading", escape(self.texts[idx]["heading"]))
+
+
+def snippet_html(text: str, spans) -> str:
+    # Window of SNIPPET_CHARS around the first match, matches wrapped in <mark>.
+    lo = max(0, spans[0][0] - SNIPPET_CHARS // 3)
+    lo = text.rfind(" ", 0, lo) + 1 if lo else 0  # start on a word boundary
+    hi = min(len(text), lo + SNIPPET_CHARS)
+    if hi < len(text):
+        hi = max(text.rfind(" ", spans[0][1], hi), spans[0][1])
+    out = ["…" if lo else ""]
+    pos = lo
+    for start, end in spans:
+        if start < pos or end > hi:
+            continue
+        out.append(escape(text[pos:start]))
+        out.append(f"<mark>{escape(text[start:end])}</mark>")
+        pos = end
+    out.append(escape(text[pos:hi]))
+    out.append("…" if hi < len(text) else "")
+    return "".join(out)
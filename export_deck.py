@@ -0,0 +1,451 @@
+import argparse
+import dataclasses
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+from decks import DECKS, get_deck
+from render import ENGINE_COLORS, ENGINE_RECTS, content_hash
+
+# =========================
+# SLIDE EXPORT
+# =========================
+# Renders every band of a deck to a 16:9 slide (dictionary card, ages,
+# heading/bullets, diagnosis/prescription, check-engine icon and the health
+# chart) and writes the set as PPTX and/or PDF:
+#
+#   python export_deck.py --out exports                 # every deck, both formats
+#   python export_deck.py --deck sal-health --format pdf
+#
+# Text stays text (editable in PowerPoint, selectable in the PDF); only the
+# chart is rasterized. Charts are drawn with Pillow straight from the
+# build_health_fig spec across a process pool, and cached by content hash
+# under <out>/.cache, so unchanged charts are never redrawn. A deck whose
+# inputs haven't changed since its last export is skipped.
+#
+# PPTX needs python-pptx and PDF needs reportlab (pip install python-pptx
+# reportlab); neither is needed by the app itself.
+
+ROOT = Path(__file__).parent
+SOURCES = ("export_deck.py", "render.py", "charts.py")
+MANIFEST = ".manifest.json"
+FORMATS = ("pptx", "pdf")
+
+SLIDE_IN = (13.333, 7.5)
+# Slide regions in inches (x, y, w, h), mirroring the dashboard's two rows.
+BOXES = {
+    "dictionary": (0.4, 0.4, 4.9, 3.1),
+    "ages": (5.55, 0.4, 2.3, 3.1),
+    "bullets": (8.1, 0.4, 4.83, 3.1),
+    "diagnosis": (0.4, 3.75, 3.3, 2.45),
+    "engine": (0.4, 6.3, 3.3, 0.8),
+    "chart": (3.95, 3.75, 8.98, 3.35),
+}
+CARD_PAD_IN = 0.15
+CHART_DPI = 200
+INK = "31333F"
+FADED = "737373"  # rgba(0,0,0,0.55) on white
+CARD_LINE = "E6E6E6"
+
+
+# -------------------------
+# Slide content
+# -------------------------
+@dataclass(frozen=True, slots=True)
+class Para:
+    text: str
+    size: float  # pt
+    bold: bool = False
+    italic: bool = False
+    color: str = INK
+    center: bool = False
+
+
+def slide_text(header, band, idx: int, n: int) -> dict:
+    return {
+        "dictionary": [
+            Para(header.slide_title, 18, bold=True),
+            Para(f"{header.word}  ·  {header.pos}", 16, bold=True),
+            Para(header.phon, 12, italic=True, color=FADED),
+            Para(f"1)  {header.def1}", 11),
+            Para(f"2)  {header.def2}", 11),
+        ],
+        "ages": [
+            Para(f"Ages {band.a0}–{band.a1}", 24, bold=True, center=True),
+            Para(f"{idx + 1} / {n}", 11, color=FADED, center=True),
+        ],
+        "bullets": [Para(band.heading, 15, bold=True)] + [Para(f"•  {x}", 11) for x in band.bullets],
+        "diagnosis": [
+            Para("DIAGNOSIS", 9, bold=True, color=FADED),
+            Para(band.diagnosis, 11),
+            Para("PRESCRIPTION", 9, bold=True, color=FADED),
+            Para(band.prescription, 11),
+        ],
+        "engine": [Para("CHECK ENGINE", 9, bold=True, color=FADED)],
+    }
+
+
+def engine_box():
+    # Square icon at the right end of the engine card
+    x, y, w, h = BOXES["engine"]
+    side = h - 2 * 0.08
+    return x + w - side - CARD_PAD_IN, y + 0.08, side, side
+
+
+# -------------------------
+# Raster: chart and engine icon
+# -------------------------
+# Draws the subset of the plotly spec that build_health_fig produces (line
+# and tonexty-filled scatter traces, fixed axis ranges, array ticks, y grid)
+# at 2x, then downsamples for antialiasing.
+SUPERSAMPLE = 2
+CHART_PX = (round(BOXES["chart"][2] * CHART_DPI), round(BOXES["chart"][3] * CHART_DPI))
+PLOT_MARGIN = (94, 19, 12, 59)  # l, r, t, b in spec px; tick labels and title sit outside
+RGBA = re.compile(r"rgba?\(([^)]*)\)")
+TAG = re.compile(r"<[^>]+>")
+
+
+def parse_color(value: str, alpha: float = 1.0):
+    if value == "white":
+        return (255, 255, 255, round(255 * alpha))
+    if value.startswith("#"):
+        r, g, b = (int(value[i : i + 2], 16) for i in (1, 3, 5))
+        return (r, g, b, round(255 * alpha))
+    parts = [float(p) for p in RGBA.match(value).group(1).split(",")]
+    a = parts[3] if len(parts) == 4 else 1.0
+    return (round(parts[0]), round(parts[1]), round(parts[2]), round(255 * a * alpha))
+
+
+@lru_cache(maxsize=16)
+def font(px: int):
+    return ImageFont.load_default(size=px)
+
+
+class ChartRaster:
+    def __init__(self, layout: dict, size):
+        self.s = SUPERSAMPLE
+        w, h = size[0] * self.s, size[1] * self.s
+        self.scale = h / layout["height"]  # spec px -> raster px
+        self.paper = parse_color(layout["paper_bgcolor"])
+        self.img = Image.new("RGBA", (w, h), self.paper)
+        self.draw_ = ImageDraw.Draw(self.img)
+        self.layout = layout
+
+        l, r, t, b = (v * self.scale for v in PLOT_MARGIN)
+        self.left, self.right, self.top, self.bottom = l, w - r, t, h - b
+        self.xr = layout["xaxis"]["range"]
+        self.yr = layout["yaxis"]["range"]
+
+    def pt(self, x, y):
+        (x0, x1), (y0, y1) = self.xr, self.yr
+        return (
+            self.left + (x - x0) / (x1 - x0) * (self.right - self.left),
+            self.top + (y1 - y) / (y1 - y0) * (self.bottom - self.top),
+        )
+
+    def ink(self, value: str):
+        # Grid, axes and text sit on the plain background, so their alpha is
+        # flattened against it up front instead of compositing a layer each.
+        r, g, b, a = parse_color(value)
+        a /= 255
+        return tuple(round(c * a + p * (1 - a)) for c, p in zip((r, g, b), self.paper)) + (255,)
+
+    def shape(self, color, draw_fn):
+        # Trace lines and fills may overlap each other: translucent ones are
+        # drawn on a layer and alpha-composited.
+        if color[3] == 255:
+            draw_fn(self.draw_, color)
+            return
+        layer = Image.new("RGBA", self.img.size, (0, 0, 0, 0))
+        draw_fn(ImageDraw.Draw(layer), color)
+        self.img.alpha_composite(layer)
+
+    def line(self, xy, color: str, width: float):
+        self.draw_.line(xy, fill=self.ink(color), width=max(1, round(width * self.scale)))
+
+    def text(self, xy, text: str, size: float, color: str, anchor: str):
+        c = self.ink(color)
+        self.draw_.text(
+            xy,
+            TAG.sub("", text),
+            font=font(round(size * self.scale)),
+            fill=c,
+            anchor=anchor,
+            stroke_width=round(self.scale / 2) if "<b>" in text else 0,
+            stroke_fill=c,
+        )
+
+    def draw(self, fig: dict) -> bytes:
+        layout, sc = self.layout, self.scale
+        xa, ya = layout["xaxis"], layout["yaxis"]
+        self.draw_.rectangle((self.left, self.top, self.right, self.bottom), fill=self.ink(layout["plot_bgcolor"]))
+
+        if ya.get("showgrid"):
+            for v in ya["tickvals"]:
+                y = self.pt(self.xr[0], v)[1]
+                self.line((self.left, y, self.right, y), ya["gridcolor"], 1)
+
+        previous = None
+        for trace in fig["data"]:
+            if trace.get("yaxis", "y") != "y":
+                continue
+            points = [self.pt(x, y) for x, y in zip(trace["x"], trace["y"])]
+            if trace.get("fill") == "tonexty" and previous:
+                self.shape(parse_color(trace["fillcolor"]), lambda d, c: d.polygon(points + previous[::-1], fill=c))
+            width = trace.get("line", {}).get("width", 2)
+            if width and len(points) > 1:
+                color = parse_color(trace.get("line", {}).get("color", "#444444"))
+                self.shape(color, lambda d, c: d.line(points, fill=c, width=round(width * sc), joint="curve"))
+            previous = points
+
+        if xa.get("showline"):
+            self.line((self.left, self.bottom, self.right, self.bottom), xa["linecolor"], xa["linewidth"])
+        if ya.get("showline"):
+            self.line((self.left, self.top, self.left, self.bottom), ya["linecolor"], ya["linewidth"])
+
+        # The 77/92 annotations are drawn as bold x tick labels, as in svg_axes
+        bold = {note["x"] for note in layout.get("annotations", ())}
+        tick = 5 * sc
+        for v, label in zip(xa["tickvals"], xa["ticktext"]):
+            if v in bold:
+                label = f"<b>{label}</b>"
+            x = self.pt(v, self.yr[0])[0]
+            if xa.get("ticks") == "outside":
+                self.line((x, self.bottom, x, self.bottom + tick), xa["linecolor"], 1)
+            self.text((x, self.bottom + tick + 3 * sc), label, xa["tickfont"]["size"], xa["tickfont"]["color"], "mt")
+        for v, label in zip(ya["tickvals"], ya["ticktext"]):
+            y = self.pt(self.xr[0], v)[1]
+            self.text((self.left - 8 * sc, y), label, ya["tickfont"]["size"], ya["tickfont"]["color"], "rm")
+
+        title = xa.get("title", {})
+        if title.get("text"):
+            self.text(
+                ((self.left + self.right) / 2, self.img.height - 8 * sc),
+                title["text"],
+                title["font"]["size"],
+                title["font"]["color"],
+                "md",
+            )
+
+        out = io.BytesIO()
+        self.img.resize((self.img.width // self.s, self.img.height // self.s), Image.LANCZOS).convert("RGB").save(out, "PNG")
+        return out.getvalue()
+
+
+def rasterize_job(job):
+    # Runs in a worker process: spec JSON -> cached PNG file.
+    spec_json, path = job
+    fig = json.loads(spec_json)
+    Path(path).write_bytes(ChartRaster(fig["layout"], CHART_PX).draw(fig))
+    return path
+
+
+@lru_cache(maxsize=None)
+def engine_png(color_key: str, px: int = 256) -> bytes:
+    s = px / 64
+    img = Image.new("RGBA", (px, px), (0, 0, 0, 0))
+    for x, y, w, h, rx, fill, opacity in ENGINE_RECTS:
+        layer = Image.new("RGBA", img.size, (0, 0, 0, 0))
+        color = parse_color(fill or ENGINE_COLORS[color_key], opacity)
+        ImageDraw.Draw(layer).rounded_rectangle((x * s, y * s, (x + w) * s, (y + h) * s), radius=rx * s, fill=color)
+        img.alpha_composite(layer)
+    out = io.BytesIO()
+    img.save(out, "PNG")
+    return out.getvalue()
+
+
+# -------------------------
+# Writers
+# -------------------------
+def write_pptx(path: Path, slides):
+    try:
+        from pptx import Presentation
+        from pptx.dml.color import RGBColor
+        from pptx.enum.shapes import MSO_SHAPE
+        from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+        from pptx.util import Inches, Pt
+    except ImportError:
+        raise SystemExit("PPTX export needs python-pptx: pip install python-pptx") from None
+
+    def card(shapes, box):
+        x, y, w, h = (Inches(v) for v in box)
+        shape = shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, x, y, w, h)
+        shape.adjustments[0] = 0.06
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = RGBColor(255, 255, 255)
+        shape.line.color.rgb = RGBColor.from_string(CARD_LINE)
+        shape.shadow.inherit = False
+        return shape
+
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Inches(SLIDE_IN[0]), Inches(SLIDE_IN[1])
+    for slide in slides:
+        s = prs.slides.add_slide(prs.slide_layouts[6])  # blank
+        for name, paras in slide["text"].items():
+            tf = card(s.shapes, BOXES[name]).text_frame
+            tf.word_wrap = True
+            tf.vertical_anchor = MSO_ANCHOR.TOP
+            tf.margin_left = tf.margin_right = tf.margin_top = tf.margin_bottom = Inches(CARD_PAD_IN)
+            for i, para in enumerate(paras):
+                p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+                p.alignment = PP_ALIGN.CENTER if para.center else PP_ALIGN.LEFT
+                p.space_after = Pt(4)
+                run = p.add_run()
+                run.text = para.text
+                run.font.size = Pt(para.size)
+                run.font.bold = para.bold
+                run.font.italic = para.italic
+                run.font.color.rgb = RGBColor.from_string(para.color)
+
+        x, y, w, h = BOXES["chart"]
+        card(s.shapes, BOXES["chart"])
+        s.shapes.add_picture(io.BytesIO(slide["chart"]), Inches(x + 0.05), Inches(y + 0.05), Inches(w - 0.1), Inches(h - 0.1))
+        x, y, w, h = engine_box()
+        s.shapes.add_picture(io.BytesIO(slide["engine"]), Inches(x), Inches(y), Inches(w), Inches(h))
+
+    prs.save(str(path))
+
+
+def write_pdf(path: Path, slides):
+    try:
+        from reportlab.lib.colors import HexColor
+        from reportlab.lib.enums import TA_CENTER, TA_LEFT
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.lib.utils import ImageReader
+        from reportlab.pdfgen import canvas
+        from reportlab.platypus import Frame, Paragraph
+    except ImportError:
+        raise SystemExit("PDF export needs reportlab: pip install reportlab") from None
+
+    page_h = SLIDE_IN[1] * inch
+
+    def rect(box):
+        x, y, w, h = box
+        return x * inch, page_h - (y + h) * inch, w * inch, h * inch
+
+    def style(para: Para):
+        face = "Helvetica-Bold" if para.bold else "Helvetica-Oblique" if para.italic else "Helvetica"
+        return ParagraphStyle(
+            "slide",
+            fontName=face,
+            fontSize=para.size,
+            leading=para.size * 1.3,
+            textColor=HexColor("#" + para.color),
+            alignment=TA_CENTER if para.center else TA_LEFT,
+            spaceAfter=4,
+        )
+
+    c = canvas.Canvas(str(path), pagesize=(SLIDE_IN[0] * inch, page_h))
+    c.setStrokeColor(HexColor("#" + CARD_LINE))
+    for slide in slides:
+        for name, paras in slide["text"].items():
+            x, y, w, h = rect(BOXES[name])
+            c.roundRect(x, y, w, h, 0.12 * inch, stroke=1, fill=0)
+            pad = CARD_PAD_IN * inch
+            frame = Frame(x, y, w, h, leftPadding=pad, rightPadding=pad, topPadding=pad, bottomPadding=pad)
+            frame.addFromList([Paragraph(escape(p.text, quote=False), style(p)) for p in paras], c)
+
+        x, y, w, h = rect(BOXES["chart"])
+        c.roundRect(x, y, w, h, 0.12 * inch, stroke=1, fill=0)
+        c.drawImage(ImageReader(io.BytesIO(slide["chart"])), x + 0.05 * inch, y + 0.05 * inch, w - 0.1 * inch, h - 0.1 * inch)
+        x, y, w, h = rect(engine_box())
+        c.drawImage(ImageReader(io.BytesIO(slide["engine"])), x, y, w, h, mask="auto")
+        c.showPage()
+    c.save()
+
+
+WRITERS = {"pptx": write_pptx, "pdf": write_pdf}
+
+
+def export_job(job):
+    # Slides for one deck from its already-drawn chart PNGs
+    deck_id, chart_paths, out, formats = job
+    deck = get_deck(deck_id)
+    n = len(deck.bands)
+    slides = [
+        {
+            "text": slide_text(deck.header, band, idx, n),
+            "chart": Path(chart_paths[idx]).read_bytes(),
+            "engine": engine_png(band.engine.value),
+        }
+        for idx, band in enumerate(deck.bands)
+    ]
+    for fmt in formats:
+        WRITERS[fmt](Path(out) / f"{deck_id}.{fmt}", slides)
+    return deck_id
+
+
+# -------------------------
+# Build
+# -------------------------
+def deck_inputs_hash(deck, chart_names, formats, code_hash: str) -> str:
+    inputs = {
+        "header": dataclasses.asdict(deck.header),
+        "bands": [dataclasses.asdict(band) for band in deck.bands],
+        "charts": chart_names,
+        "formats": sorted(formats),
+        "code": code_hash,
+    }
+    return content_hash(json.dumps(inputs, sort_keys=True, ensure_ascii=False))
+
+
+def export(out: Path, deck_ids, formats, jobs: int, force: bool = False):
+    cache = out / ".cache"
+    cache.mkdir(parents=True, exist_ok=True)
+    code_hash = content_hash(b"".join((ROOT / name).read_bytes() for name in SOURCES))
+
+    manifest_path = out / MANIFEST
+    manifest = {} if force or not manifest_path.exists() else json.loads(manifest_path.read_text())
+
+    charts_todo, decks_todo, hashes = {}, [], {}
+    for deck_id in deck_ids:
+        deck = get_deck(deck_id)
+        chart_paths = []
+        for band in deck.bands:
+            spec_json = deck.figure(band.a1)["json"]
+            path = cache / f"{content_hash(spec_json + code_hash)[:20]}.png"
+            chart_paths.append(str(path))
+            if force or not path.exists():
+                charts_todo[str(path)] = (spec_json, str(path))
+
+        hashes[deck_id] = deck_inputs_hash(deck, [Path(p).name for p in chart_paths], formats, code_hash)
+        outputs_exist = all((out / f"{deck_id}.{fmt}").exists() for fmt in formats)
+        if manifest.get(deck_id) != hashes[deck_id] or not outputs_exist:
+            decks_todo.append((deck_id, chart_paths, str(out), list(formats)))
+
+    if charts_todo or decks_todo:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(rasterize_job, charts_todo.values()))
+            list(pool.map(export_job, decks_todo))
+
+    manifest.update(hashes)
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return len(charts_todo), len(decks_todo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export every band of a deck to PPTX/PDF slides.")
+    parser.add_argument("--out", default="exports", help="output directory (default: exports)")
+    parser.add_argument("--deck", action="append", choices=sorted(DECKS), help="deck to export (default: all)")
+    parser.add_argument("--format", action="append", choices=FORMATS, help="output format (default: pptx and pdf)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="redraw every chart and rewrite every deck")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    drawn, exported = export(Path(args.out), args.deck or list(DECKS), args.format or list(FORMATS), args.jobs, args.force)
+    print(f"Drew {drawn} chart(s), exported {exported} deck(s) into {args.out}/ in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import atexit
+import cProfile
+import io
+import json
+import logging
+import logging.handlers
+import os
+import pstats
+import queue
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+# -------------------------
+# Timing spans
+# -------------------------
+# Process-wide rolling window of recent timings per span name. Set
+# LRP_TIMINGS_LOG to also append every sample to a JSONL file; lines are
+# queued to one writer thread that keeps the file open, so a span never waits
+# on file I/O (or on another session's).
+WINDOW = 1024
+LOG_PATH = os.environ.get("LRP_TIMINGS_LOG")
+
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))
+_lock = threading.Lock()
+
+
+def _timings_log():
+    log = logging.getLogger("lrp.timings")
+    log.propagate = False
+    if LOG_PATH and not log.handlers:
+        lines = queue.SimpleQueue()
+        writer = logging.FileHandler(LOG_PATH, encoding="utf-8")
+        listener = logging.handlers.QueueListener(lines, writer)
+        listener.start()
+        atexit.register(listener.stop)  # flushes what's still queued
+        log.addHandler(logging.handlers.QueueHandler(lines))
+        log.setLevel(logging.INFO)
+    return log
+
+
+_log = _timings_log()
+
+
+def record(name: str, ms: float):
+    with _lock:
+        _samples[name].append(ms)
+    if LOG_PATH:
+        _log.info(json.dumps({"ts": time.time(), "span": name, "ms": round(ms, 3)}))
+
+
+@contextmanager
+def span(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - t0) * 1000)
+
+
+def timed(name: str):
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def percentile(sorted_values, q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def summary():
+    with _lock:
+        snapshot = {name: sorted(values) for name, values in _samples.items() if values}
+    return [
+        {
+            "span": name,
+            "count": len(values),
+            "p50_ms": round(percentile(values, 0.50), 3),
+            "p90_ms": round(percentile(values, 0.90), 3),
+            "p99_ms": round(percentile(values, 0.99), 3),
+            "max_ms": round(values[-1], 3),
+        }
+        for name, values in sorted(snapshot.items())
+    ]
+
+
+# -------------------------
+# On-demand profiler
+# -------------------------
+# Only one profiler can be active per process on newer Pythons, so concurrent
+# requests simply skip profiling instead of failing the rerun.
+_profile_lock = threading.Lock()
+
+
+class ProfileResult:
+    def __init__(self):
+        self.profile = None
+
+    def text(self, limit: int = 30) -> str:
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def dump(self) -> bytes:
+        # pstats only writes to files, so round-trip through a temp file.
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rerun.prof")
+            self.profile.dump_stats(path)
+            with open(path, "rb") as f:
+                return f.read()
+
+
+@contextmanager
+def profiled(enabled: bool):
+    result = ProfileResult()
+    if not enabled or not _profile_lock.acquire(blocking=False):
+        yield result
+        return
+
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+        try:
+            yield result
+        finally:
+            profile.disable()
+        result.profile = profile
+    finally:
+        _profile_lock.release()
@@ -0,0 +1,274 @@
+import os
+from functools import lru_cache
+from hashlib import sha256
+from html import escape
+from html.parser import HTMLParser
+from pathlib import Path
+
+# -------------------------
+# CSS: tuned to reduce clipping at 100% zoom
+# -------------------------
+APP_CSS = """
+/* More top padding to avoid header clipping */
+.block-container { padding-top: 2.0rem; padding-bottom: 1.0rem; max-width: 1500px; }
+
+/* Cards */
+.lrp-card {
+  background: rgba(255,255,255,0.97);
+  border: 1px solid rgba(0,0,0,0.06);
+  border-radius: 18px;
+  box-shadow: 0 8px 24px rgba(0,0,0,0.06);
+  padding: 16px 16px 14px 16px;
+}
+
+/* Header */
+.lrp-title {
+  font-weight: 850;
+  letter-spacing: 0.4px;
+  font-size: 24px;
+  margin-bottom: 10px;
+}
+
+/* Dictionary styling */
+.lrp-dictword { font-size: 20px; font-weight: 850; margin-top: 4px; }
+.lrp-pos { font-size: 13px; color: rgba(0,0,0,0.55); font-weight: 650; margin-left: 8px; }
+.lrp-phon { font-size: 16px; color: rgba(0,0,0,0.50); margin-top: 6px; font-style: italic; }
+.lrp-def { font-size: 14px; margin-top: 10px; line-height: 1.35; }
+.lrp-defnum { color: rgba(0,0,0,0.55); font-weight: 850; display: inline-block; width: 26px; }
+
+/* Right heading */
+.lrp-heading { font-size: 18px; font-weight: 900; margin: 0 0 10px 0; }
+
+/* Bullets */
+.lrp-bullets { font-size: 14px; line-height: 1.4; }
+.lrp-bullets ul { margin: 0; padding-left: 18px; }
+.lrp-bullets li { margin: 6px 0; }
+
+/* Left diagnosis card labels */
+.lrp-label {
+  font-weight: 900;
+  letter-spacing: 0.6px;
+  font-size: 12px;
+  color: rgba(0,0,0,0.55);
+  margin-top: 6px;
+  text-transform: uppercase;
+  display:flex;
+  align-items:center;
+  gap:10px;
+}
+.lrp-body { font-size: 14px; line-height: 1.45; margin-top: 6px; margin-bottom: 10px; }
+
+/* Icons (bigger) */
+.lrp-ico { font-size: 28px; width: 32px; text-align: center; }
+
+/* Check engine svg (bigger icon) */
+.engine-svg { width: 74px; height: 74px; }
+
+/* Navigation */
+.ages-label { font-size: 22px; font-weight: 900; text-align:center; margin-top: 8px; }
+.dots { display:flex; justify-content:center; gap: 6px; margin-top: 8px; }
+.dot { width: 7px; height: 7px; border-radius: 50%; background: rgba(0,0,0,0.18); }
+.dot.active { background: #d11a1a; }
+
+/* Plot container */
+.plot-card { padding: 10px 14px 6px 14px; }
+"""
+
+# Kiosk/autoplay: no Streamlit chrome, and each swapped-in card fades in
+# (opacity only, so it stays on the compositor on weak hardware).
+KIOSK_CSS = """
+header[data-testid="stHeader"] { display: none; }
+@keyframes lrp-fade { from { opacity: 0.25; } to { opacity: 1; } }
+.lrp-card { animation: lrp-fade 0.45s ease-out both; will-change: opacity; }
+"""
+
+
+# -------------------------
+# Static assets
+# -------------------------
+# The stylesheet and the check-engine sprite are content-hashed files served
+# by Streamlit's static file serving (static/ -> /app/static/). Pages only
+# carry a <link> and <use href> to them, so each browser downloads them once.
+# Set LRP_ASSET_BASE when they are served from another URL (e.g. a base path).
+ASSET_BASE = os.environ.get("LRP_ASSET_BASE", "/app/static/")
+
+ENGINE_COLORS = {
+    "green": "#17a34a",
+    "yellow": "#f59e0b",
+    "orange": "#f97316",
+    "red": "#ef4444",
+}
+
+
+# The check-engine icon on a 64x64 grid, as (x, y, w, h, rx, fill, opacity)
+# rectangles; fill None means the engine color. The sprite and the slide
+# exporter both draw from this.
+ENGINE_RECTS = (
+    (10, 20, 44, 26, 6, None, 0.16),
+    (16, 22, 32, 24, 6, None, 1.0),
+    (12, 30, 6, 10, 0, None, 1.0),
+    (52, 30, 6, 10, 0, None, 1.0),
+    (26, 28, 12, 12, 2, "white", 0.92),
+    (26, 18, 12, 4, 0, None, 1.0),
+    (28, 46, 8, 4, 0, None, 1.0),
+)
+
+
+def engine_symbol(color_key: str, c: str) -> str:
+    rects = "".join(
+        f'  <rect x="{x}" y="{y}" width="{w}" height="{h}" rx="{rx}" fill="{fill or c}" opacity="{opacity}"/>\n'
+        for x, y, w, h, rx, fill, opacity in ENGINE_RECTS
+    )
+    return f'<symbol id="engine-{color_key}" viewBox="0 0 64 64">\n{rects}</symbol>\n'
+
+
+SPRITE_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg">\n'
+    + "".join(engine_symbol(key, c) for key, c in ENGINE_COLORS.items())
+    + "</svg>\n"
+)
+
+
+def content_hash(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return sha256(data).hexdigest()
+
+
+def hashed_name(pattern: str, text: str) -> str:
+    return pattern.format(content_hash(text)[:12])
+
+
+CSS_FILE = hashed_name("lrp.{}.css", APP_CSS)
+SPRITE_FILE = hashed_name("engines.{}.svg", SPRITE_SVG)
+STATIC_FILES = {CSS_FILE: APP_CSS, SPRITE_FILE: SPRITE_SVG}
+
+
+def write_static_file(directory, name: str, text: str) -> None:
+    # Hashed names never change content, so existing files are left alone.
+    path = Path(directory) / name
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+def write_static_assets(directory) -> None:
+    for name, text in STATIC_FILES.items():
+        write_static_file(directory, name, text)
+
+
+def stylesheet_url() -> str:
+    return ASSET_BASE + CSS_FILE
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def esc(value) -> str:
+    return escape(str(value), quote=False)
+
+
+def engine_svg(color_key: str) -> str:
+    # Bigger engine (no outer circle); the drawing itself lives in the sprite.
+    return (
+        '<svg class="engine-svg" role="img" aria-label="Check engine">'
+        f'<use href="{ASSET_BASE}{SPRITE_FILE}#engine-{esc(color_key)}"/></svg>'
+    )
+
+
+@lru_cache(maxsize=256)
+def dots_html(active_idx: int, n: int) -> str:
+    dots = []
+    for i in range(n):
+        cls = "dot active" if i == active_idx else "dot"
+        dots.append(f'<div class="{cls}"></div>')
+    return '<div class="dots">' + "".join(dots) + "</div>"
+
+
+# -------------------------
+# Card markup
+# -------------------------
+# Band text is plain text, so everything interpolated below is escaped.
+def dictionary_card_html(h) -> str:
+    return f"""
+<div class="lrp-card">
+  <div class="lrp-title">{esc(h.slide_title)}</div>
+  <div class="lrp-dictword">
+    {esc(h.word)} <span class="lrp-pos">· {esc(h.pos)}</span>
+  </div>
+  <div class="lrp-phon">{esc(h.phon)}</div>
+
+  <div class="lrp-def"><span class="lrp-defnum">1)</span> {esc(h.def1)}</div>
+  <div class="lrp-def"><span class="lrp-defnum">2)</span> {esc(h.def2)}</div>
+</div>
+"""
+
+
+def ages_label_html(b) -> str:
+    return f'<div class="ages-label">Ages {esc(b.a0)}–{esc(b.a1)}</div>'
+
+
+def bullets_card_html(b) -> str:
+    bullets_html = "<ul>" + "".join([f"<li>{esc(x)}</li>" for x in b.bullets]) + "</ul>"
+    return f"""
+<div class="lrp-card">
+  <div class="lrp-heading">{esc(b.heading)}</div>
+  <div class="lrp-bullets">{bullets_html}</div>
+</div>
+"""
+
+
+def diagnosis_card_html(b) -> str:
+    return f"""
+<div class="lrp-card">
+  <div class="lrp-label"><span class="lrp-ico">🩺</span><b>DIAGNOSIS</b></div>
+  <div class="lrp-body">{esc(b.diagnosis)}</div>
+
+  <div class="lrp-label" style="margin-top:12px;"><span class="lrp-ico">💊</span><b>PRESCRIPTION</b></div>
+  <div class="lrp-body">{esc(b.prescription)}</div>
+
+  <div class="lrp-label" style="margin-top:12px;"><span class="lrp-ico">🛠️</span><b>CHECK ENGINE</b></div>
+  <div style="margin-top:8px;">
+    {engine_svg(b.engine.value)}
+  </div>
+</div>
+"""
+
+
+# -------------------------
+# Precompiled band markup
+# -------------------------
+# Every band's cards are built (and checked) once when a deck loads; renders
+# just emit these strings, byte-identical across reruns and sessions.
+VOID_TAGS = {"br", "hr", "img", "input", "meta", "link"}
+
+
+class _TagBalance(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.stack = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if not self.stack or self.stack.pop() != tag:
+            raise ValueError(f"Unbalanced </{tag}>")
+
+
+def validate_html(markup: str) -> str:
+    checker = _TagBalance()
+    checker.feed(markup)
+    checker.close()
+    if checker.stack:
+        raise ValueError(f"Unclosed <{checker.stack[-1]}>")
+    return markup
+
+
+def compile_band_html(b) -> dict:
+    return {
+        "ages": validate_html(ages_label_html(b)),
+        "bullets": validate_html(bullets_card_html(b)),
+        "diagnosis": validate_html(diagnosis_card_html(b)),
+    }
@@ -0,0 +1,44 @@
+import dataclasses
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import broadcast
+
+# =========================
+# APP SERVER WITH THE FOLLOWER ROUTE
+# =========================
+# Serves app.py as `streamlit run app.py` does, plus one route for followers
+# that render the deck in the browser (?follow=1&nav=client):
+#
+#   GET /follow?version=12      the presenter's state once it is no longer
+#                               version 12, or unchanged after LONG_POLL_S
+#
+# A follower keeps one such request open, so while the presenter stays on a
+# band it costs the server nothing, and a change answers every follower's
+# waiting request at once instead of waiting for each one's next poll or
+# rerun. Without this entry point (plain `streamlit run app.py`), those
+# followers fall back to polling from the band fragment.
+#
+#   streamlit run serve.py
+LONG_POLL_S = 25.0
+
+
+async def follow(request) -> Response:
+    try:
+        version = int(request.query_params["version"])
+    except (KeyError, ValueError):
+        return JSONResponse({"error": "version must be an integer"}, status_code=400)
+    state = await broadcast.HUB.wait(version, LONG_POLL_S)
+    return JSONResponse(dataclasses.asdict(state), headers={"Cache-Control": "no-store"})
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    broadcast.HUB.serve_long_polls()
+    yield
+
+
+app = st.App("app.py", routes=[Route(broadcast.FOLLOW_ROUTE, follow)], lifespan=lifespan)
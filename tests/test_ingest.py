@@ -0,0 +1,149 @@
+import io
+import sys
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import decks  # noqa: E402
+from decks import ingest  # noqa: E402
+from decks.model import build_bands  # noqa: E402
+from decks.sal_health import BANDS  # noqa: E402
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def para(text: str, style: str = "", listed: bool = False) -> str:
+    props = ""
+    if style or listed:
+        props = "<w:pPr>"
+        props += f'<w:pStyle w:val="{style}"/>' if style else ""
+        props += '<w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr>' if listed else ""
+        props += "</w:pPr>"
+    return f'<w:p>{props}<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def docx(*paras: str) -> io.BytesIO:
+    # The smallest zip the parser reads: just word/document.xml
+    body = "".join(paras)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("word/document.xml", f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>')
+    buf.seek(0)
+    return buf
+
+
+def parse(*paras: str) -> list:
+    return ingest.parse_bands(ingest.paragraphs(docx(*paras)))
+
+
+def test_headings_bullets_and_labels():
+    bands = parse(
+        para("Life Reclamation Project", "Title"),
+        para("Speaker notes before the first band are ignored."),
+        para("Ages 0–5: Foundations", "Heading1"),
+        para("Sleep and play", listed=True),
+        para("Vaccinations", "ListParagraph"),
+        para("Diagnosis: Growing fast."),
+        para("Prescription: Keep moving."),
+        para("Engine: Green"),
+        para("5-12.5 School years", "Heading2"),
+        para("Diagnosis: Mostly fine."),
+        para("Rx: Outdoors daily."),
+        para("Check engine: yellow"),
+    )
+    assert bands == [
+        {
+            "a0": 0,
+            "a1": 5,
+            "heading": "Foundations",
+            "bullets": ["Sleep and play", "Vaccinations"],
+            "diagnosis": "Growing fast.",
+            "prescription": "Keep moving.",
+            "engine": "green",
+        },
+        {
+            "a0": 5,
+            "a1": 12.5,
+            "heading": "School years",
+            "bullets": [],
+            "diagnosis": "Mostly fine.",
+            "prescription": "Outdoors daily.",
+            "engine": "yellow",
+        },
+    ]
+
+
+def test_plain_paragraphs_continue_the_last_label():
+    (band,) = parse(
+        para("Ages 40–50: Midlife", "Heading1"),
+        para("A bullet before any label"),
+        para("Diagnosis: First part."),
+        para("Second   part,\tsame diagnosis."),
+        para("A list item ends it", listed=True),
+        para("Prescription: Walk."),
+        para("And lift."),
+        para("Engine: orange"),
+    )
+    assert band["bullets"] == ["A bullet before any label", "A list item ends it"]
+    assert band["diagnosis"] == "First part. Second part, same diagnosis."
+    assert band["prescription"] == "Walk. And lift."
+
+
+def test_heading_text_outside_a_heading_style_is_not_a_band():
+    (band,) = parse(
+        para("Ages 0–5: Foundations", "Heading1"),
+        para("Ages 5–10 is only mentioned here", listed=True),
+        para("Engine: red"),
+    )
+    assert band["bullets"] == ["Ages 5–10 is only mentioned here"]
+
+
+def test_bad_engine_value_fails_validation():
+    bands = parse(para("Ages 0–5: Foundations", "Heading1"), para("Engine: purple"))
+    with pytest.raises(ValueError, match="unknown engine color 'purple'"):
+        build_bands(bands)
+
+
+def test_document_without_age_headings():
+    with pytest.raises(ValueError, match="No age-range headings"):
+        parse(para("Just a title", "Title"), para("And some text"))
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        io.BytesIO(b"PK\x03\x04 half-saved"),  # not a zip
+        docx(para("Ages 0–5: Foundations", "Heading1")[:-6]),  # truncated XML
+    ],
+    ids=["bad-zip", "bad-xml"],
+)
+def test_malformed_documents_raise_ingest_errors(source):
+    with pytest.raises(ingest.ERRORS):
+        ingest.parse_bands(ingest.paragraphs(source))
+
+
+def test_zip_without_document_xml():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("word/styles.xml", "<styles/>")
+    with pytest.raises(KeyError):
+        list(ingest.paragraphs(buf))
+    assert issubclass(KeyError, ingest.ERRORS)
+
+
+def test_malformed_document_on_first_load_falls_back_to_module_bands(tmp_path, monkeypatch, caplog):
+    bad = tmp_path / "deck.docx"
+    bad.write_bytes(b"PK\x03\x04 half-saved")
+    monkeypatch.setitem(decks.DECKS["sal-health"], "docx", str(bad))
+
+    deck = decks.load_deck("sal-health")
+    assert deck.bands == build_bands(BANDS)
+    assert deck.source == bad  # still watched, so fixing the file reloads it
+    assert "uses its built-in bands" in caplog.text
+    with pytest.raises(ingest.ERRORS):
+        decks.load_deck("sal-health", previous=deck)
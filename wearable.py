@@ -0,0 +1,144 @@
+import csv
+import io
+import math
+from array import array
+from datetime import date
+
+from charts import AGE_MAX, X_RANGE
+
+# =========================
+# WEARABLE OVERLAY
+# =========================
+# Reads a personal time series (a wearable/health-app CSV export: daily
+# steps, VO2max, weight, ...) and reduces it to a few thousand points for
+# overlaying on the health chart. Rows are streamed straight into columnar
+# float arrays, then downsampled with largest-triangle-three-buckets (LTTB),
+# so even multi-million-row exports never reach the browser in full.
+#
+# The time column is either an age in years or a date (mapped to age via the
+# date of birth); any other numeric column can be the value.
+OVERLAY_POINTS = 2000
+AGE_COLUMNS = ("age",)
+DATE_COLUMNS = ("date", "day", "datetime", "timestamp", "time", "start", "startdate")
+DAYS_PER_YEAR = 365.2425
+NOT_UTF8 = "The CSV isn't UTF-8 text; re-export it as UTF-8"
+
+
+def text_stream(raw):
+    raw.seek(0)
+    return io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+
+
+def read_header(raw) -> list:
+    stream = text_stream(raw)
+    try:
+        return [name.strip() for name in next(csv.reader(stream), [])]
+    except UnicodeDecodeError:
+        raise ValueError(NOT_UTF8) from None
+    finally:
+        stream.detach()  # leave the upload itself open
+
+
+def time_column(header) -> int:
+    for i, name in enumerate(header):
+        if name.lower() in AGE_COLUMNS + DATE_COLUMNS:
+            return i
+    return 0
+
+
+def value_columns(header) -> list:
+    t = time_column(header)
+    return [name for i, name in enumerate(header) if i != t]
+
+
+def parse_series(raw, value: str, birth: date | None = None):
+    # Streams rows into (ages, values) arrays; rows that don't parse, and
+    # ages off the chart, are skipped.
+    stream = text_stream(raw)
+    try:
+        rows = csv.reader(stream)
+        header = [name.strip() for name in next(rows, [])]
+        if value not in header:
+            raise ValueError(f"Column {value!r} not found in the CSV header")
+        t, v = time_column(header), header.index(value)
+        by_age = header[t].lower() in AGE_COLUMNS
+        if not by_age and birth is None:
+            raise ValueError("A date of birth is needed to place dated rows on the age axis")
+
+        ages, values = array("d"), array("d")
+        width = max(t, v) + 1
+        lo, hi = X_RANGE[0], AGE_MAX
+        for row in rows:
+            if len(row) < width:
+                continue
+            try:
+                y = float(row[v])
+                if by_age:
+                    x = float(row[t])
+                else:
+                    x = (date.fromisoformat(row[t].strip()[:10]) - birth).days / DAYS_PER_YEAR
+            except ValueError:
+                continue
+            if math.isfinite(x) and math.isfinite(y) and lo <= x <= hi:  # NaN/inf aren't valid JSON
+                ages.append(x)
+                values.append(y)
+    except UnicodeDecodeError:
+        raise ValueError(NOT_UTF8) from None
+    finally:
+        stream.detach()
+
+    if not ages:
+        raise ValueError(f"No usable rows for {value!r}")
+    return sort_series(ages, values)
+
+
+def sort_series(xs, ys):
+    if all(a <= b for a, b in zip(xs, xs[1:])):
+        return xs, ys
+    # Exports are often newest-first; anything else gets a full sort.
+    if all(a >= b for a, b in zip(xs, xs[1:])):
+        xs.reverse()
+        ys.reverse()
+        return xs, ys
+    order = sorted(range(len(xs)), key=xs.__getitem__)
+    return array("d", (xs[i] for i in order)), array("d", (ys[i] for i in order))
+
+
+def lttb(xs, ys, threshold: int):
+    # Largest-triangle-three-buckets: keeps the first and last point and, per
+    # bucket, the point forming the largest triangle with the previously kept
+    # point and the average of the next bucket.
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+
+    out_x, out_y = [xs[0]], [ys[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        nxt0 = int((i + 1) * every) + 1
+        nxt1 = min(int((i + 2) * every) + 1, n)
+        avg_x = sum(xs[nxt0:nxt1]) / (nxt1 - nxt0)
+        avg_y = sum(ys[nxt0:nxt1]) / (nxt1 - nxt0)
+
+        ax, ay = xs[a], ys[a]
+        dx, dy = avg_x - ax, avg_y - ay
+        best, best_area = nxt0 - 1, -1.0
+        for j in range(int(i * every) + 1, nxt0):
+            area = abs(dx * (ys[j] - ay) - (xs[j] - ax) * dy)
+            if area > best_area:
+                best, best_area = j, area
+
+        out_x.append(xs[best])
+        out_y.append(ys[best])
+        a = best
+
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
+
+
+def overlay_series(raw, value: str, birth: date | None = None, points: int = OVERLAY_POINTS):
+    xs, ys = parse_series(raw, value, birth)
+    sx, sy = lttb(xs, ys, points)
+    return {"x": [round(x, 4) for x in sx], "y": sy, "rows": len(xs)}